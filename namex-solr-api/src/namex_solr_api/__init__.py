@@ -46,8 +46,9 @@ from flask_jwt_oidc import JwtManager
 from namex_solr_api import models
 from namex_solr_api.config import DevelopmentConfig, MigrationConfig, ProductionConfig, UnitTestingConfig
 from namex_solr_api.models import db
+from namex_solr_api.models.user import user_cache
 from namex_solr_api.resources import internal_bp, ops_bp, v1_bp
-from namex_solr_api.services import jwt, solr
+from namex_solr_api.services import jwt, search_history, search_result_cache, solr
 from namex_solr_api.services.auth import auth_cache
 from namex_solr_api.version import get_run_version
 from structured_logging import StructuredLogging
@@ -72,6 +73,10 @@ def create_app(environment: str = os.getenv("DEPLOYMENT_ENV", "production"), **k
 
     else:
         solr.init_app(app)
+        search_history.init_app(app)
+        search_result_cache.init_app(app)
+        user_cache.maxsize = app.config.get("USER_CACHE_SIZE", 1000)
+        user_cache.ttl = app.config.get("USER_CACHE_TTL", 300)
         app.register_blueprint(internal_bp)
         app.register_blueprint(ops_bp)
         app.register_blueprint(v1_bp)
@@ -63,10 +63,70 @@ class Config:
     SOLR_SVC_NAMEX_FOLLOWER_CORE = os.getenv("SOLR_SVC_NAMEX_FOLLOWER_CORE", "name_request_follower")
     SOLR_SVC_NAMEX_LEADER_URL = os.getenv("SOLR_SVC_NAMEX_LEADER_URL", "http://localhost:8863/solr")
     SOLR_SVC_NAMEX_FOLLOWER_URL = os.getenv("SOLR_SVC_NAMEX_FOLLOWER_URL", "http://localhost:8863/solr")
+    # comma separated list of followers to spread reads across (defaults to the single follower url)
+    SOLR_SVC_NAMEX_FOLLOWER_URLS = [  # noqa: RUF012
+        url.strip() for url in os.getenv("SOLR_SVC_NAMEX_FOLLOWER_URLS", "").split(",") if url.strip()
+    ]
     SOLR_SVC_NAMEX_MAX_ROWS = int(os.getenv("SOLR_SVC_NAMEX_MAX_ROWS", "10000"))
+    # cache of built base queries (also cleared on synonym updates)
+    SOLR_QUERY_CACHE_SIZE = int(os.getenv("SOLR_QUERY_CACHE_SIZE", "1000"))
+    SOLR_QUERY_CACHE_TTL = int(os.getenv("SOLR_QUERY_CACHE_TTL", "300"))  # seconds
+    # synonyms used to build queries are kept in memory and reloaded on synonym updates or after the ttl
+    SOLR_SYNONYM_TRIE_TTL = int(os.getenv("SOLR_SYNONYM_TRIE_TTL", "300"))  # seconds
+    # query complexity budget (fuzzy clauses, boost variants and then low value fields are dropped when exceeded
+    # and queries that still don't fit are rejected)
+    SOLR_QUERY_MAX_CLAUSES = int(os.getenv("SOLR_QUERY_MAX_CLAUSES", "300"))
+    SOLR_QUERY_MAX_FUZZY_CLAUSES = int(os.getenv("SOLR_QUERY_MAX_FUZZY_CLAUSES", "40"))
+    # doc frequencies of the most common name terms (fuzzy matching is skipped for common terms and tightened
+    # where there are many similar terms)
+    SOLR_TERM_STATS_ENABLED = os.getenv("SOLR_TERM_STATS_ENABLED", "True") == "True"
+    SOLR_TERM_STATS_TTL = int(os.getenv("SOLR_TERM_STATS_TTL", "3600"))  # seconds
+    SOLR_TERM_STATS_LIMIT = int(os.getenv("SOLR_TERM_STATS_LIMIT", "20000"))
+    SOLR_FUZZY_COMMON_DOC_FREQ = int(os.getenv("SOLR_FUZZY_COMMON_DOC_FREQ", "10000"))
+    SOLR_FUZZY_DENSE_PREFIX_TERMS = int(os.getenv("SOLR_FUZZY_DENSE_PREFIX_TERMS", "50"))
+    # send searches as terms / filters referencing the search profiles (paramsets) in the core's params.json
+    SOLR_SEARCH_PROFILES_ENABLED = os.getenv("SOLR_SEARCH_PROFILES_ENABLED", "False") == "True"
+
+    # Solr follower read routing (followers are ejected after failures and the leader is used if none are left)
+    SOLR_ROUTER_EJECT_FAILURES = int(os.getenv("SOLR_ROUTER_EJECT_FAILURES", "3"))
+    SOLR_ROUTER_EJECT_ERROR_RATE = float(os.getenv("SOLR_ROUTER_EJECT_ERROR_RATE", "0.6"))
+    SOLR_ROUTER_EJECT_SECONDS = int(os.getenv("SOLR_ROUTER_EJECT_SECONDS", "30"))
+    # Solr hedged follower queries (a duplicate query is sent to a 2nd follower if the 1st is slower than the
+    # given percentile of recent query latencies, bounded by the min/max delay)
+    SOLR_HEDGE_ENABLED = os.getenv("SOLR_HEDGE_ENABLED", "False") == "True"
+    SOLR_HEDGE_PERCENTILE = float(os.getenv("SOLR_HEDGE_PERCENTILE", "95"))
+    SOLR_HEDGE_MIN_DELAY_MS = int(os.getenv("SOLR_HEDGE_MIN_DELAY_MS", "50"))
+    SOLR_HEDGE_MAX_DELAY_MS = int(os.getenv("SOLR_HEDGE_MAX_DELAY_MS", "1000"))
+    SOLR_HEDGE_MAX_WORKERS = int(os.getenv("SOLR_HEDGE_MAX_WORKERS", "16"))
+
+    # Solr connection pool settings (pools are kept per solr url and shared across threads)
+    SOLR_POOL_CONNECTIONS = int(os.getenv("SOLR_POOL_CONNECTIONS", "10"))
+    SOLR_POOL_MAXSIZE = int(os.getenv("SOLR_POOL_MAXSIZE", "10"))
+    SOLR_POOL_BLOCK = os.getenv("SOLR_POOL_BLOCK", "False") == "True"
+    SOLR_POOL_IDLE_TIMEOUT = int(os.getenv("SOLR_POOL_IDLE_TIMEOUT", "300"))  # seconds
+    # gzip json request bodies sent to solr (requires jetty.gzip.inflateBufferSize to be set on the solr nodes)
+    SOLR_GZIP_REQUESTS = os.getenv("SOLR_GZIP_REQUESTS", "False") == "True"
+    SOLR_GZIP_MIN_SIZE = int(os.getenv("SOLR_GZIP_MIN_SIZE", "2048"))  # bytes
+    SOLR_GZIP_LEVEL = int(os.getenv("SOLR_GZIP_LEVEL", "5"))
+    # body format of bulk updates: 'json' (json list of docs) or 'commands' (chunked stream of solr add commands)
+    SOLR_BULK_UPDATE_FORMAT = os.getenv("SOLR_BULK_UPDATE_FORMAT", "json")
+
+    # Solr retries (retries are capped by the request timeout and by the budget: ratio of requests in the window)
+    SOLR_RETRY_TOTAL = int(os.getenv("SOLR_RETRY_TOTAL", "2"))
+    SOLR_RETRY_BACKOFF_FACTOR = float(os.getenv("SOLR_RETRY_BACKOFF_FACTOR", "0.5"))
+    SOLR_RETRY_BACKOFF_MAX = float(os.getenv("SOLR_RETRY_BACKOFF_MAX", "2"))  # seconds
+    SOLR_RETRY_BUDGET_RATIO = float(os.getenv("SOLR_RETRY_BUDGET_RATIO", "0.1"))
+    SOLR_RETRY_BUDGET_MIN_PER_SECOND = float(os.getenv("SOLR_RETRY_BUDGET_MIN_PER_SECOND", "1"))
+    SOLR_RETRY_BUDGET_WINDOW_SECONDS = int(os.getenv("SOLR_RETRY_BUDGET_WINDOW_SECONDS", "10"))
+    # Solr circuit breakers (per node: open after consecutive failures and send probes after the open period)
+    SOLR_BREAKER_FAILURE_THRESHOLD = int(os.getenv("SOLR_BREAKER_FAILURE_THRESHOLD", "5"))
+    SOLR_BREAKER_OPEN_SECONDS = int(os.getenv("SOLR_BREAKER_OPEN_SECONDS", "30"))
+    SOLR_BREAKER_HALF_OPEN_PROBES = int(os.getenv("SOLR_BREAKER_HALF_OPEN_PROBES", "1"))
 
     AUTH_SVC_URL = os.getenv("AUTH_API_URL", "") + os.getenv("AUTH_API_VERSION", "")
 
+    # Used by /import endpoint (max size of a gzip request body once decompressed)
+    MAX_IMPORT_DECOMPRESSED_SIZE = int(os.getenv("MAX_IMPORT_DECOMPRESSED_SIZE", str(500 * 1024 * 1024)))
     # Used by /sync endpoint
     MAX_BATCH_UPDATE_NUM = int(os.getenv("MAX_BATCH_UPDATE_NUM", "500"))
     # Used by /sync heartbeat
@@ -124,6 +184,30 @@ class Config:
     else:
         SQLALCHEMY_DATABASE_URI = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+    # search history is queued and inserted in batches by a background thread (when the queue is full the
+    # search is dropped with policy 'drop' or written during the request with policy 'sync')
+    SEARCH_HISTORY_ASYNC = os.getenv("SEARCH_HISTORY_ASYNC", "True") == "True"
+    SEARCH_HISTORY_SAMPLE_RATE = float(os.getenv("SEARCH_HISTORY_SAMPLE_RATE", "1"))
+    SEARCH_HISTORY_QUEUE_SIZE = int(os.getenv("SEARCH_HISTORY_QUEUE_SIZE", "1000"))
+    SEARCH_HISTORY_BATCH_SIZE = int(os.getenv("SEARCH_HISTORY_BATCH_SIZE", "100"))
+    SEARCH_HISTORY_FLUSH_INTERVAL = float(os.getenv("SEARCH_HISTORY_FLUSH_INTERVAL", "2"))  # seconds
+    SEARCH_HISTORY_FULL_POLICY = os.getenv("SEARCH_HISTORY_FULL_POLICY", "drop")
+
+    # search results are cached until the followers replicate a new index (version checked once per interval)
+    # NOTE: off by default, enable per environment once the version invalidation is verified against its replication
+    SEARCH_RESULT_CACHE_ENABLED = os.getenv("SEARCH_RESULT_CACHE_ENABLED", "False") == "True"
+    SEARCH_RESULT_CACHE_TIMEOUT = int(os.getenv("SEARCH_RESULT_CACHE_TIMEOUT", "3600"))  # seconds
+    SEARCH_RESULT_CACHE_MAX_ROWS = int(os.getenv("SEARCH_RESULT_CACHE_MAX_ROWS", "1000"))
+    SEARCH_RESULT_CACHE_VERSION_INTERVAL = float(os.getenv("SEARCH_RESULT_CACHE_VERSION_INTERVAL", "10"))  # seconds
+    # results are kept apart from the auth cache (own directory / size limit with the filesystem cache)
+    SEARCH_RESULT_CACHE_DIR = os.getenv("SEARCH_RESULT_CACHE_DIR", "search_cache")
+    SEARCH_RESULT_CACHE_THRESHOLD = int(os.getenv("SEARCH_RESULT_CACHE_THRESHOLD", "5000"))
+
+    # bulk possible conflict searches run concurrently and unfinished searches are cancelled after the deadline
+    MAX_BULK_SEARCH_VALUES = int(os.getenv("MAX_BULK_SEARCH_VALUES", "500"))
+    BULK_SEARCH_MAX_CONCURRENCY = int(os.getenv("BULK_SEARCH_MAX_CONCURRENCY", "10"))
+    BULK_SEARCH_DEADLINE = float(os.getenv("BULK_SEARCH_DEADLINE", "30"))  # seconds
+
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv("JWT_OIDC_WELL_KNOWN_CONFIG")
     JWT_OIDC_ALGORITHMS = os.getenv("JWT_OIDC_ALGORITHMS")
@@ -145,6 +229,9 @@ class Config:
     JWT_OIDC_FIRSTNAME = os.getenv("JWT_OIDC_FIRSTNAME", "firstname")
     JWT_OIDC_LASTNAME = os.getenv("JWT_OIDC_LASTNAME", "lastname")
     JWT_OIDC_LOGIN_SOURCE = os.getenv("JWT_OIDC_LOGIN_SOURCE", "loginSource")
+    # users resolved from a jwt are kept in memory (changed claims get a new entry)
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1000"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))  # seconds
 
 
 class DevelopmentConfig(Config):
@@ -170,6 +257,10 @@ class UnitTestingConfig(Config):
     SOLR_SVC_LEADER_URL = os.getenv("SOLR_SVC_LEADER_TEST_URL", "http://localhost:8990/solr")
     SOLR_SVC_FOLLOWER_URL = os.getenv("SOLR_SVC_FOLLOWER_TEST_URL", "http://localhost:8990/solr")
     TEMP_SOLR_SVC_TEST_URL = os.getenv("TEMP_SOLR_SVC_TEST_URL", "http://localhost:8991/solr")
+    # write search history during the request so tests can check it
+    SEARCH_HISTORY_ASYNC = False
+    # tests search right after loading data so results are not cached
+    SEARCH_RESULT_CACHE_ENABLED = False
     # POSTGRESQL
     DB_USER = os.getenv("DATABASE_TEST_USERNAME", "")
     DB_PASSWORD = os.getenv("DATABASE_TEST_PASSWORD", "")
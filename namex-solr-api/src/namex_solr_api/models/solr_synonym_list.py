@@ -83,6 +83,11 @@ class SolrSynonymList(Base):
         """Return all the solr synonym objects for the type."""
         return cls.query.filter_by(synonym_type=synonym_type.value).all()
 
+    @classmethod
+    def get_all_synonyms(cls, synonym_type: Type) -> list[str]:
+        """Return all the synonym phrases for the type."""
+        return [row.synonym for row in cls.query.with_entities(cls.synonym).filter_by(synonym_type=synonym_type.value)]
+
     @classmethod
     def find_all_beginning_with_phrase(cls, phrase: str, synonym_type: Type) -> list[SolrSynonymList]:
         """Return all the solr synonym objects for synonyms including the given phrase/word."""
@@ -44,9 +44,10 @@ from typing import TYPE_CHECKING
 
 from flask import current_app
 from sqlalchemy import DateTime, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, make_transient_to_detached, mapped_column, relationship
 
 from namex_solr_api.common.base_enum import BaseEnum
+from namex_solr_api.common.ttl_cache import TTLCache
 from namex_solr_api.exceptions import BusinessException
 from namex_solr_api.services import auth
 
@@ -58,6 +59,9 @@ if TYPE_CHECKING:
     from namex_solr_api.models.solr_doc import SolrDoc
     
 
+# users resolved from a jwt (configured by the app)
+user_cache = TTLCache(maxsize=1000, ttl=300)
+
 
 class User(Base):
     """Used to hold the audit information for a User of this service."""
@@ -148,7 +152,14 @@ class User(Base):
 
     @classmethod
     def get_or_create_user_by_jwt(cls, jwt_oidc_token: dict):
-        """Return a valid user for audit tracking purposes."""
+        """Return a valid user for audit tracking purposes.
+
+        Users are cached by their unique key and jwt claims so unchanged users are returned without a db lookup
+        (or auth call for BCEID users) until the cache ttl passes.
+        """
+        cache_key = cls.get_cache_key(jwt_oidc_token)
+        if cached_values := user_cache.get(cache_key):
+            return cls.from_cached_values(cached_values)
         # GET existing or CREATE new user based on the JWT info
         try:
             user = User.find_by_jwt_token(jwt_oidc_token)
@@ -157,14 +168,13 @@ class User(Base):
                 current_app.logger.debug(f"didnt find user, attempting to create new user:{jwt_oidc_token}")
                 user = User.create_from_jwt_token(jwt_oidc_token)
             elif jwt_oidc_token.get("loginSource") == "BCEID":  # BCEID doesn't use the jwt values for their name
-                current_app.logger.debug("BCEID user, updating first and last names...")
+                current_app.logger.debug("BCEID user, checking for changes to first and last names...")
                 auth_user = auth.get_user_info()
-                if user.firstname != auth_user["firstname"]:
+                if user.firstname != auth_user["firstname"] or user.lastname != auth_user["lastname"]:
                     user.firstname = auth_user["firstname"]
-                if user.lastname != auth_user["lastname"]:
                     user.lastname = auth_user["lastname"]
-                user.save()
-                current_app.logger.debug("Updated user.")
+                    user.save()
+                    current_app.logger.debug("Updated user.")
             else:
                 # update if there are any values that weren't saved previously or have changed since
                 current_app.logger.debug("Checking for changes to jwt info...")
@@ -174,6 +184,7 @@ class User(Base):
                     {"jwt_key": current_app.config.get("JWT_OIDC_LASTNAME"), "table_key": "lastname"},
                     {"jwt_key": "sub", "table_key": "sub"},
                 ]
+                updated = False
                 for keys in user_keys:
                     value = jwt_oidc_token.get(keys["jwt_key"], None)
                     if value and value != getattr(user, keys["table_key"]):
@@ -181,10 +192,35 @@ class User(Base):
                             f'found new user value, attempting to update user {keys["table_key"]}:{value}'
                         )
                         setattr(user, keys["table_key"], value)
-                        user.save()
-                        current_app.logger.debug(f"Updated user {value}.")
+                        updated = True
+                if updated:
+                    user.save()
+                    current_app.logger.debug(f"Updated user {user.id}.")
 
+            if user:
+                user_cache.set(cache_key, {column.key: getattr(user, column.key) for column in cls.__table__.columns})
             return user
         except Exception as err:
             current_app.logger.error(err.with_traceback(None))
             raise BusinessException(message="Unable to get or create user.", error=err.with_traceback(None)) from err
+
+    @staticmethod
+    def get_cache_key(jwt_oidc_token: dict) -> tuple:
+        """Return the user cache key for the token (its unique user key and the claims saved on the user)."""
+        claims = [
+            current_app.config.get("JWT_OIDC_UNIQUE_USER_KEY"),
+            current_app.config.get("JWT_OIDC_USERNAME"),
+            current_app.config.get("JWT_OIDC_FIRSTNAME"),
+            current_app.config.get("JWT_OIDC_LASTNAME"),
+            "sub",
+            "iss",
+            "loginSource",
+        ]
+        return tuple(jwt_oidc_token.get(claim) for claim in claims)
+
+    @classmethod
+    def from_cached_values(cls, values: dict) -> User:
+        """Return the cached user attached to the current session (without loading it from the db)."""
+        user = cls(**values)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
@@ -0,0 +1,75 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""API endpoint for exporting the possible conflicts in solr."""
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from flask_cors import cross_origin
+
+from namex_solr_api.exceptions import bad_request_response, exception_response
+from namex_solr_api.models import User
+from namex_solr_api.services import jwt, solr
+
+bp = Blueprint("EXPORT", __name__, url_prefix="/export")
+
+
+@bp.get("")
+@cross_origin(origins="*")
+@jwt.requires_roles([User.Role.system.value])
+def export_possible_conflicts():
+    """Stream every possible conflict in solr as NDJSON (one parent doc with its names per line)."""
+    try:
+        conflict_type = request.args.get("type")
+        if conflict_type and conflict_type not in ["CORP", "NR"]:
+            return bad_request_response("Invalid params.", ['Expecting "type" to be one of ["CORP", "NR"].'])
+
+        rows = request.args.get("rows", "1000")
+        if not rows.isdigit() or not 0 < int(rows) <= current_app.config["SOLR_SVC_NAMEX_MAX_ROWS"]:
+            return bad_request_response(
+                "Invalid params.",
+                [f'Expecting "rows" to be between 1 and {current_app.config["SOLR_SVC_NAMEX_MAX_ROWS"]}.'])
+
+        docs = solr.export_possible_conflicts(conflict_type, int(rows))
+        # NOTE: get the first doc up front so solr errors are returned before the response starts
+        first_doc = next(docs, None)
+
+        def generate():
+            """Yield each doc as a json line."""
+            if first_doc is not None:
+                yield current_app.json.dumps(first_doc) + "\n"
+            for doc in docs:
+                yield current_app.json.dumps(doc) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    except Exception as exception:
+        return exception_response(exception)
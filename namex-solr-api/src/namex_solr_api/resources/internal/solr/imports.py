@@ -32,12 +32,14 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """API endpoint for bulk importing records into solr."""
+import json
+import zlib
 from http import HTTPStatus
 
 from flask import Blueprint, current_app, jsonify, request
 from flask_cors import cross_origin
 
-from namex_solr_api.exceptions import bad_request_response, exception_response
+from namex_solr_api.exceptions import BusinessException, bad_request_response, exception_response
 from namex_solr_api.models import User
 from namex_solr_api.services import jwt, solr
 from namex_solr_api.services.namex_solr.doc_models import PossibleConflict
@@ -45,13 +47,32 @@ from namex_solr_api.services.namex_solr.doc_models import PossibleConflict
 bp = Blueprint("IMPORT", __name__, url_prefix="/import")
 
 
+def _get_request_json() -> dict:
+    """Return the request json, decompressing gzip encoded bodies (capped to prevent decompression bombs)."""
+    if request.headers.get("Content-Encoding", "").lower() != "gzip":
+        return request.json
+    max_size = current_app.config["MAX_IMPORT_DECOMPRESSED_SIZE"]
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    try:
+        data = decompressor.decompress(request.get_data(), max_size)
+    except zlib.error as err:
+        raise BusinessException(error=f"Invalid gzip payload: {err}",
+                                message="Invalid payload.",
+                                status_code=HTTPStatus.BAD_REQUEST) from err
+    if decompressor.unconsumed_tail:
+        raise BusinessException(error=f"Decompressed payload exceeds {max_size} bytes.",
+                                message="Payload too large.",
+                                status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return json.loads(data)
+
+
 @bp.put("")
 @cross_origin(origins="*")
 @jwt.requires_roles([User.Role.system.value])
 def import_possible_conflicts():
     """Import 'possible conflicts' into namex search SOLR."""
     try:
-        request_json: dict = request.json
+        request_json: dict = _get_request_json()
         if not (doc_list := request_json.get("possibleConflicts", [])):
             return bad_request_response("Invalid payload.", ['Expecting required field: "possibleConflicts"'])
 
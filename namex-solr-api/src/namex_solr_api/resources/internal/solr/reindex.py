@@ -51,9 +51,9 @@ bp = Blueprint("REINDEX", __name__, url_prefix="/reindex")
 # -----------------------------
 # Helper function
 # -----------------------------
-def get_replication_detail(field: str, leader: bool):
+def get_replication_detail(field: str, leader: bool, node_url: str | None = None):
     """Return the replication detail for the core, safely handling optional follower."""
-    details: dict = solr.replication("details", leader).json().get("details", {})
+    details: dict = solr.replication("details", leader, node_url).json().get("details", {})
 
     # Remove unwanted data
     if field != "commits" and "commits" in details:
@@ -106,15 +106,16 @@ def reindex_prep_endpoint():
             raise SolrException("Failed to backup leader index", HTTPStatus.INTERNAL_SERVER_ERROR)
 
         if current_app.config.get("HAS_FOLLOWER", True):
-            is_polling_disabled = get_replication_detail("isPollingDisabled", False)
-            if is_polling_disabled is None:
-                current_app.logger.warning("Follower details missing; cannot verify polling status.")
-            elif not bool(is_polling_disabled):
-                raise SolrException(
-                    "Failed to disable polling on follower",
-                    str(is_polling_disabled),
-                    HTTPStatus.INTERNAL_SERVER_ERROR,
-                )
+            for follower_url in solr.follower_urls:
+                is_polling_disabled = get_replication_detail("isPollingDisabled", False, follower_url)
+                if is_polling_disabled is None:
+                    current_app.logger.warning("Follower details missing; cannot verify polling status.")
+                elif not bool(is_polling_disabled):
+                    raise SolrException(
+                        f"Failed to disable polling on follower {follower_url}",
+                        str(is_polling_disabled),
+                        HTTPStatus.INTERNAL_SERVER_ERROR,
+                    )
 
             disable_replication = solr.replication("disablereplication", True)
             current_app.logger.debug(disable_replication.json())
@@ -136,23 +136,25 @@ def _update_solr(entity_ids: list[str], doc_events: list[SolrDocEvent]):
 def _validate_follower(now: datetime):
     """Return validation errors to do with the follower Solr instance."""
     errors = []
-    if solr.follower_url != solr.leader_url:
+    for follower_url in solr.follower_urls:
+        if follower_url == solr.leader_url:
+            continue
         # verify the follower core details
-        details: dict = (solr.replication("details", False)).json()["details"]
+        details: dict = (solr.replication("details", False, follower_url)).json()["details"]
         # NOTE: replace tzinfo needed because strptime %Z is not working as documented
         #   - issue: accepts the tz in the string but doesn't add it to the dateime obj
         last_replication = (datetime.strptime(details["follower"]["indexReplicatedAt"],
                                                 "%a %b %d %H:%M:%S %Z %Y")).replace(tzinfo=UTC)
-        current_app.logger.debug(f"Last replication was at {last_replication.isoformat()}")
+        current_app.logger.debug(f"Last replication for {follower_url} was at {last_replication.isoformat()}")
 
         # verify polling is active
         if details["follower"]["isPollingDisabled"] == "true":
-            errors.append("Follower polling disabled when it should be enabled.")
+            errors.append(f"Follower {follower_url} polling disabled when it should be enabled.")
 
         # verify last_replication datetime is within a reasonable timeframe
         if last_replication + timedelta(hours=current_app.config.get("LAST_REPLICATION_THRESHOLD")) < now:
             # its been too long since a replication. Log / return error
-            errors.append("Follower last replication datetime is longer than expected.")
+            errors.append(f"Follower {follower_url} last replication datetime is longer than expected.")
 
     return errors
 
@@ -38,8 +38,9 @@ from flask import Blueprint, current_app
 from sqlalchemy import exc, text
 
 from namex_solr_api.exceptions import SolrException
-from namex_solr_api.models import db
-from namex_solr_api.services import solr
+from namex_solr_api.models import User, db
+from namex_solr_api.models.user import user_cache
+from namex_solr_api.services import jwt, search_history, search_result_cache, solr
 
 bp = Blueprint("OPS", __name__, url_prefix="/ops")
 
@@ -66,6 +67,30 @@ def healthy():
     return {"message": "api is healthy"}, HTTPStatus.OK
 
 
+@bp.get("/metrics")
+@jwt.requires_roles([User.Role.system.value])
+def metrics():
+    """Return a JSON object with the current solr client metrics (includes the solr node urls so system only)."""
+    return {
+        "solr": {
+            "followers": solr.router.stats(),
+            "hedging": {
+                **solr.hedge_stats.to_dict(),
+                "enabled": solr.hedge_enabled,
+                "delayMs": round(solr.get_hedge_delay() * 1000, 2),
+            },
+            "breakers": {url: breaker.to_dict() for url, breaker in solr.breakers.items()},
+            "retryBudget": solr.retry_budget.to_dict(),
+            "queryCache": solr.query_builder.base_query_cache.stats(),
+            "synonyms": solr.query_builder.synonym_stats(),
+            "termStats": solr.query_builder.term_stats_info(),
+        },
+        "searchHistory": search_history.stats(),
+        "searchResultCache": search_result_cache.stats(),
+        "userCache": user_cache.stats(),
+    }, HTTPStatus.OK
+
+
 @bp.get("/readyz")
 def ready():
     """Return a JSON object that identifies if the service is setupAnd ready to work."""
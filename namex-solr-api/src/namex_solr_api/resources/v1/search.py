@@ -33,18 +33,26 @@
 # POSSIBILITY OF SUCH DAMAGE.
 # TODO: add search endpoints replicating namex queries ? Maybe don't need this
 """Exposes all of the search endpoints in Flask-Blueprint style."""
+from collections.abc import Iterator
 from http import HTTPStatus
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask.globals import request_ctx
 from flask_cors import cross_origin
 
-from namex_solr_api.exceptions import exception_response
-from namex_solr_api.models import SearchHistory, User
-from namex_solr_api.services import jwt, solr
+from namex_solr_api.exceptions import bad_request_response, exception_response
+from namex_solr_api.models import User
+from namex_solr_api.services import jwt, search_history, search_result_cache, solr
 from namex_solr_api.services.base_solr.utils import QueryParams
+from namex_solr_api.services.base_solr.utils.stream_parser import SolrDocStream
 from namex_solr_api.services.namex_solr.doc_models import NameField, PCField
-from namex_solr_api.services.namex_solr.utils import namex_search, prep_query_str_namex
+from namex_solr_api.services.namex_solr.utils import (
+    namex_search,
+    namex_search_bulk,
+    namex_search_classify_highlights,
+    namex_search_stream,
+    prep_query_str_namex,
+)
 
 bp = Blueprint("SEARCH", __name__, url_prefix="/search")
 
@@ -62,136 +70,223 @@ def possible_conflict_names():
         # if errors:
         #     return bad_request_response("Errors processing request.", errors)  # noqa: ERA001
 
-        # set base query params
-        query_json: dict = request_json.get("query", {})
-        value = query_json.get("value")
-        query = {
-            "value": prep_query_str_namex(value, "replace"),
-            PCField.CORP_NUM_Q.value: prep_query_str_namex(query_json.get(PCField.CORP_NUM.value, "")),
-            PCField.NR_NUM_Q.value: prep_query_str_namex(query_json.get(PCField.NR_NUM.value, ""))
-        }
-        # set faceted category params
-        categories_json: dict = request_json.get("categories", {})
-        # TODO: verify these states
-        conflict_states = ["ACTIVE", "APPROVED", "CONDITION"]
-        categories = {
-            PCField.JURISDICTION: categories_json.get(PCField.JURISDICTION.value, None),
-            PCField.STATE: categories_json.get(PCField.STATE.value, conflict_states)
-        }
-        # set nested child query params
-        child_query = {
-            NameField.NAME_Q_SINGLE.value: prep_query_str_namex(query_json.get(NameField.NAME.value, ""))
-        }
-        # set nested child faceted category params
-        # TODO: verify these states
-        conflict_name_states = ["A", "C", "CORP"]
-        child_categories = {
-            NameField.NAME_STATE: categories_json.get(NameField.NAME_STATE.value, conflict_name_states)
-        }
+        params = get_possible_conflict_names_params(query_json=request_json.get("query", {}),
+                                                    categories_json=request_json.get("categories", {}),
+                                                    start=request_json.get("start", solr.default_start),
+                                                    rows=request_json.get("rows", solr.default_rows))
+        cache_key = search_result_cache.get_key("possible_conflict_names", params)
+        if not (search_results := search_result_cache.get(cache_key)):
+            results = namex_search(params, solr, True)
+            search_results = get_possible_conflict_names_results(results, params)
+            search_result_cache.set(cache_key, search_results)
+        # save search in the db (queued and written in batches off of the response path)
+        search_history.record(query=request_json, results=search_results["results"], submitter_id=user.id)
 
-        start = request_json.get("start", solr.default_start)
-        rows = request_json.get("rows", solr.default_rows)
+        return jsonify({"searchResults": search_results}), HTTPStatus.OK
 
-        params = QueryParams(
-            query=query,
-            rows=rows,
-            start=start,
-            categories=categories,
-            child_query=child_query,
-            child_categories=child_categories,
-            fields=solr.resp_fields_nested,
-            highlighted_fields=[NameField.NAME_Q_SINGLE, NameField.NAME_Q_STEM_HIGHLIGHT, NameField.NAME_Q_SYN],
-            query_boost_fields={
-                NameField.NAME_Q_AGRO: 2,
-                NameField.NAME_Q_SINGLE: 2,
-                NameField.NAME_Q_XTRA: 2,
-                NameField.NAME_Q_SYN: 2
-            },
-            query_fields={
-                NameField.NAME_Q: "child",
-                NameField.NAME_Q_AGRO: "child",
-                NameField.NAME_Q_STEM_HIGHLIGHT: "child",
-                NameField.NAME_Q_SINGLE: "child",
-                NameField.NAME_Q_XTRA: "child",
-            },
-            query_fuzzy_fields={
-                NameField.NAME_Q: {"short": 1, "long": 2},
-                NameField.NAME_Q_AGRO: {"short": 1, "long": 2},
-                NameField.NAME_Q_SINGLE: {"short": 0, "long": 2}
-            },
-            query_synonym_fields={
-                NameField.NAME_Q_SYN: "child"
-            },
-            full_query_boosts=solr.get_name_search_full_query_boost(value)
-        )
+    except Exception as exception:
+        return exception_response(exception)
 
-        results = namex_search(params, solr, True)
-        solr_highlighting: dict[str, dict[str, list[str]]] = results.get("highlighting")
-        docs = []
-        for result in results.get("response", {}).get("docs"):
-            def split_highlights(highlights: list[str]):
-                """Split list of strings into list of single terms"""
-                resp = []
-                for highlight in highlights:
-                    resp += highlight.upper().split(" ")
-                return resp
-
-            highlight_raw = solr_highlighting[result[NameField.UNIQUE_KEY.value]]
-            exact_highlights = []
-            stem_highlights = []
-            synonym_highlights = []
-            if exact_highlights_full_terms := highlight_raw.get(NameField.NAME_Q_SINGLE.value, []):
-                exact_highlights_full_terms = split_highlights(exact_highlights_full_terms)
-                for term in params.query["value"].split(" "):
-                    if any(x for x in exact_highlights_full_terms if term.upper() in x):
-                        exact_highlights.append(term.upper())
-            if stem_highlights := highlight_raw.get(NameField.NAME_Q_STEM_HIGHLIGHT.value, []):
-                stem_highlights = [x for x in split_highlights(stem_highlights) if x not in (exact_highlights)]
-            if synonym_highlights := highlight_raw.get(NameField.NAME_Q_SYN.value, []):
-                other_highlights = exact_highlights + stem_highlights
-                synonym_highlights = [x.upper() for x in synonym_highlights if x.upper() not in other_highlights]
-            docs.append({
-                **result,
-                "name": result["name"].upper(),
-                "highlighting": {
-                    "exact": list(set(exact_highlights)),
-                    "stems": list(set(stem_highlights)),
-                    "synonyms": list(set(synonym_highlights))
-                }
-            })
-        # save search in the db
-        SearchHistory(
-            query=request_json,
-            results=docs,
-            submitter_id=user.id,
-        ).save()
-
-        response = {
-            "searchResults": {
-                "queryInfo": {
-                    "categories": {
-                        **categories,
-                        **child_categories
-                    },
-                    "query": {
-                        "value": query["value"],
-                        PCField.CORP_NUM.value: query[PCField.CORP_NUM_Q.value],
-                        PCField.NR_NUM.value: query[PCField.NR_NUM_Q.value],
-                        NameField.NAME.value: child_query[NameField.NAME_Q_SINGLE.value]
-                    },
-                    "rows": rows or solr.default_rows,
-                    "start": start or solr.default_start,
-                },
-                "totalResults": results.get("response", {}).get("numFound"),
-                "results": docs
-            },
-        }
-        return jsonify(response), HTTPStatus.OK
+
+@bp.post("/possible-conflict-names/bulk")
+@cross_origin(origins="*")
+@jwt.requires_auth
+def possible_conflict_names_bulk():
+    """Return the possible conflict name results from solr for each of the given queries.
+
+    The queries share the paging of the request and its categories (unless a query gives its own) and are searched
+    concurrently. Results are keyed by the query 'key' (defaults to the query value).
+    """
+    try:
+        # NOTE: request_ctx.current_user is set by jwt.requires_auth
+        user = User.get_or_create_user_by_jwt(request_ctx.current_user)
+        request_json = request.json
+        queries: list[dict] = request_json.get("queries")
+        keys, errors = get_bulk_query_keys(queries, current_app.config.get("MAX_BULK_SEARCH_VALUES", 500))
+        errors += get_categories_errors(request_json.get("categories", {}), "categories")
+        errors += get_paging_errors(request_json, solr.max_rows)
+        if errors:
+            return bad_request_response("Errors processing request.", errors)
+
+        params_list = [
+            get_possible_conflict_names_params(query_json=query_json,
+                                               categories_json=query_json.get("categories",
+                                                                              request_json.get("categories", {})),
+                                               start=request_json.get("start", solr.default_start),
+                                               rows=request_json.get("rows", solr.default_rows))
+            for query_json in queries
+        ]
+        results = namex_search_bulk(params_list,
+                                    solr,
+                                    True,
+                                    max_concurrency=current_app.config.get("BULK_SEARCH_MAX_CONCURRENCY", 10),
+                                    deadline=current_app.config.get("BULK_SEARCH_DEADLINE", 30))
+        bulk_results = {}
+        for key, params, result in zip(keys, params_list, results, strict=True):
+            if isinstance(result, Exception):
+                current_app.logger.debug(f"Bulk search failed for {key}: {result!r}")
+                message = "Search timed out." if isinstance(result, TimeoutError) else "Search failed."
+                bulk_results[key] = {"error": message}
+            else:
+                bulk_results[key] = get_possible_conflict_names_results(result, params)
+        # save search in the db (queued and written in batches off of the response path)
+        search_history.record(query=request_json,
+                              results={key: value.get("results", []) for key, value in bulk_results.items()},
+                              submitter_id=user.id)
+
+        return jsonify({"searchResults": bulk_results}), HTTPStatus.OK
 
     except Exception as exception:
         return exception_response(exception)
 
 
+def get_bulk_query_keys(queries: list[dict], max_queries: int) -> tuple[list[str], list[dict[str, str]]]:
+    """Return the result key of each bulk query and any errors with the queries."""
+    if not isinstance(queries, list) or not 0 < len(queries) <= max_queries:
+        return [], [{"path": "queries", "error": f"Expected a list of 1 to {max_queries} queries."}]
+    keys = []
+    errors = []
+    for index, query_json in enumerate(queries):
+        path = f"queries[{index}]"
+        if not isinstance(query_json, dict):
+            errors.append({"path": path, "error": "Expected an object."})
+            continue
+        value = query_json.get("value")
+        key = query_json.get("key", value)
+        if not isinstance(value, str) or not value.strip():
+            errors.append({"path": f"{path}.value", "error": "Expected a non-empty string."})
+        elif not isinstance(key, str) or not key.strip():
+            errors.append({"path": f"{path}.key", "error": "Expected a non-empty string."})
+        elif key in keys:
+            errors.append({"path": f"{path}.key", "error": f"Duplicate key '{key}'."})
+        if "categories" in query_json:
+            errors += get_categories_errors(query_json["categories"], f"{path}.categories")
+        keys.append(key)
+    return keys, errors
+
+
+def get_categories_errors(categories_json: dict, path: str) -> list[dict[str, str]]:
+    """Return any errors with the search categories (each category is a list of string values)."""
+    if not isinstance(categories_json, dict):
+        return [{"path": path, "error": "Expected an object."}]
+    return [
+        {"path": f"{path}.{category.value}", "error": "Expected a list of strings."}
+        for category in [PCField.JURISDICTION, PCField.STATE, NameField.NAME_STATE]
+        if (values := categories_json.get(category.value)) is not None
+        and (not isinstance(values, list) or not all(isinstance(value, str) for value in values))
+    ]
+
+
+def get_paging_errors(request_json: dict, max_rows: int) -> list[dict[str, str]]:
+    """Return any errors with the start / rows of the search request."""
+    errors = []
+    start = request_json.get("start")
+    if start is not None and (not isinstance(start, int) or isinstance(start, bool) or start < 0):
+        errors.append({"path": "start", "error": "Expected a non-negative integer."})
+    rows = request_json.get("rows")
+    if rows is not None and (not isinstance(rows, int) or isinstance(rows, bool) or not 0 <= rows <= max_rows):
+        errors.append({"path": "rows", "error": f"Expected an integer between 0 and {max_rows}."})
+    return errors
+
+
+def get_possible_conflict_names_params(query_json: dict, categories_json: dict, start: int, rows: int) -> QueryParams:
+    """Return the possible conflict names search params for the request query."""
+    # set base query params
+    value = query_json.get("value")
+    query = {
+        "value": prep_query_str_namex(value, "replace"),
+        PCField.CORP_NUM_Q.value: prep_query_str_namex(query_json.get(PCField.CORP_NUM.value, "")),
+        PCField.NR_NUM_Q.value: prep_query_str_namex(query_json.get(PCField.NR_NUM.value, ""))
+    }
+    # set faceted category params
+    # TODO: verify these states
+    conflict_states = ["ACTIVE", "APPROVED", "CONDITION"]
+    categories = {
+        PCField.JURISDICTION: categories_json.get(PCField.JURISDICTION.value, None),
+        PCField.STATE: categories_json.get(PCField.STATE.value, conflict_states)
+    }
+    # set nested child query params
+    child_query = {
+        NameField.NAME_Q_SINGLE.value: prep_query_str_namex(query_json.get(NameField.NAME.value, ""))
+    }
+    # set nested child faceted category params
+    # TODO: verify these states
+    conflict_name_states = ["A", "C", "CORP"]
+    child_categories = {
+        NameField.NAME_STATE: categories_json.get(NameField.NAME_STATE.value, conflict_name_states)
+    }
+
+    return QueryParams(
+        query=query,
+        rows=rows,
+        start=start,
+        categories=categories,
+        child_query=child_query,
+        child_categories=child_categories,
+        fields=solr.resp_fields_nested,
+        highlighted_fields=[NameField.NAME_Q_SINGLE, NameField.NAME_Q_STEM_HIGHLIGHT, NameField.NAME_Q_SYN],
+        query_boost_fields={
+            NameField.NAME_Q_AGRO: 2,
+            NameField.NAME_Q_SINGLE: 2,
+            NameField.NAME_Q_XTRA: 2,
+            NameField.NAME_Q_SYN: 2
+        },
+        query_fields={
+            NameField.NAME_Q: "child",
+            NameField.NAME_Q_AGRO: "child",
+            NameField.NAME_Q_STEM_HIGHLIGHT: "child",
+            NameField.NAME_Q_SINGLE: "child",
+            NameField.NAME_Q_XTRA: "child",
+        },
+        query_fuzzy_fields={
+            NameField.NAME_Q: {"short": 1, "long": 2},
+            NameField.NAME_Q_AGRO: {"short": 1, "long": 2},
+            NameField.NAME_Q_SINGLE: {"short": 0, "long": 2}
+        },
+        query_synonym_fields={
+            NameField.NAME_Q_SYN: "child"
+        },
+        full_query_boosts=solr.get_name_search_full_query_boost(value),
+        profile="possible_conflict_names",
+        profile_values=solr.get_name_search_profile_values(value)
+    )
+
+
+def get_possible_conflict_names_results(results: dict, params: QueryParams) -> dict:
+    """Return the possible conflict names search results (docs with their highlighted terms)."""
+    solr_highlighting: dict[str, dict[str, list[str]]] = results.get("highlighting")
+    query_terms = frozenset(params.query["value"].upper().split())
+    docs = [
+        {
+            **result,
+            "name": result["name"].upper(),
+            "highlighting": namex_search_classify_highlights(query_terms,
+                                                             solr_highlighting[result[NameField.UNIQUE_KEY.value]])
+        }
+        for result in results.get("response", {}).get("docs")
+    ]
+
+    return {
+        "queryInfo": {
+            "categories": {
+                **params.categories,
+                **params.child_categories
+            },
+            "query": {
+                "value": params.query["value"],
+                PCField.CORP_NUM.value: params.query[PCField.CORP_NUM_Q.value],
+                PCField.NR_NUM.value: params.query[PCField.NR_NUM_Q.value],
+                NameField.NAME.value: params.child_query[NameField.NAME_Q_SINGLE.value]
+            },
+            "rows": params.rows or solr.default_rows,
+            "start": params.start or solr.default_start,
+            "degraded": params.degraded,
+        },
+        "totalResults": results.get("response", {}).get("numFound"),
+        "results": docs
+    }
+
+
 @bp.post("/nrs")
 @cross_origin(origins="*")
 @jwt.requires_auth
@@ -262,33 +357,61 @@ def nrs():
                 NameField.NAME_Q_SYN: "child"
             },
             # NOTE: add items to this to improve ordering as needed
-            full_query_boosts=[]
+            full_query_boosts=[],
+            profile="nrs"
         )
 
-        results = namex_search(params, solr, False)
-        docs = results.get("response", {}).get("docs")
-
-        response = {
-            "searchResults": {
-                "queryInfo": {
-                    "categories": {
-                        **categories,
-                        **child_categories
-                    },
-                    "query": {
-                        "value": query["value"],
-                        PCField.CORP_NUM.value: query[PCField.CORP_NUM_Q.value],
-                        PCField.NR_NUM.value: query[PCField.NR_NUM_Q.value],
-                        NameField.NAME.value: child_query[NameField.NAME_Q_SINGLE.value]
-                    },
-                    "rows": rows or solr.default_rows,
-                    "start": start or solr.default_start,
-                },
-                "totalResults": results.get("response", {}).get("numFound"),
-                "results": docs,
+        cache_key = search_result_cache.get_key("nrs", params)
+        if search_results := search_result_cache.get(cache_key):
+            return jsonify({"searchResults": search_results}), HTTPStatus.OK
+
+        # NOTE: docs are streamed from solr straight into the response so large pages are never fully loaded
+        # (solr errors before the first doc are raised here, before the response status is sent)
+        docs = namex_search_stream(params, solr, False)
+        query_info = {
+            "categories": {
+                **categories,
+                **child_categories
+            },
+            "query": {
+                "value": query["value"],
+                PCField.CORP_NUM.value: query[PCField.CORP_NUM_Q.value],
+                PCField.NR_NUM.value: query[PCField.NR_NUM_Q.value],
+                NameField.NAME.value: child_query[NameField.NAME_Q_SINGLE.value]
             },
+            "rows": params.rows or solr.default_rows,
+            "start": start or solr.default_start,
+            "degraded": params.degraded,
         }
-        return jsonify(response), HTTPStatus.OK
+
+        return Response(stream_with_context(stream_search_results(docs, query_info, cache_key)),
+                        status=HTTPStatus.OK,
+                        mimetype="application/json")
 
     except Exception as exception:
-        return exception_response(exception)
\ No newline at end of file
+        return exception_response(exception)
+
+
+def stream_search_results(docs: SolrDocStream, query_info: dict, cache_key: str | None) -> Iterator[str]:
+    """Yield the search results json as the docs are received (caching them if there is a cache key).
+
+    The response status is already sent when a doc after the first fails to be read, so the results are closed
+    with an 'error' instead (the json stays valid and the partial results are not cached).
+    """
+    results = []
+    with docs:
+        total_results = docs.meta.get("response", {}).get("numFound")
+        yield (f'{{"searchResults": {{"queryInfo": {current_app.json.dumps(query_info)}, '
+               f'"totalResults": {current_app.json.dumps(total_results)}, '
+               '"results": [')
+        try:
+            for index, doc in enumerate(docs):
+                if cache_key:
+                    results.append(doc)
+                yield ("," if index else "") + current_app.json.dumps(doc)
+        except Exception as err:
+            current_app.logger.error(f"Error streaming the Solr response: {err!r}")
+            yield '], "error": "Error reading Solr response. The results are incomplete."}}'
+            return
+        yield "]}}"
+    search_result_cache.set(cache_key, {"queryInfo": query_info, "totalResults": total_results, "results": results})
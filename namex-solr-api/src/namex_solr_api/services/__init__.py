@@ -35,6 +35,10 @@
 from .auth import AuthService
 from .jwt import jwt
 from .namex_solr import NamexSolr
+from .search_history_writer import SearchHistoryWriter
+from .search_result_cache import SearchResultCache
 
 auth = AuthService()
 solr = NamexSolr("SOLR_SVC_NAMEX")
+search_history = SearchHistoryWriter()
+search_result_cache = SearchResultCache(solr)
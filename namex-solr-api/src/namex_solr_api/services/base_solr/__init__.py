@@ -33,17 +33,30 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """This module wraps the solr classes/fields for using solr."""
 
+import gzip
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from http import HTTPStatus
 
 from flask import Flask, current_app
 from requests import Response, Session
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError as SolrConnectionError
+from requests.exceptions import Timeout
 
 from namex_solr_api.common.base_enum import BaseEnum
 from namex_solr_api.exceptions import SolrException
 
+from .utils import json_codec
+from .utils.circuit_breaker import CircuitBreaker, RetryBudget
+from .utils.hedging import HedgeStats, LatencyTracker, hedged_call
+from .utils.node_router import NodeRouter
+from .utils.stream_parser import SolrDocStream
+
 
 class Solr:
     """Wrapper class around the solr instance."""
@@ -58,19 +71,57 @@ class Solr:
         self.leader_core = None
         # solr urls
         self.follower_url = None
+        self.follower_urls: list[str] = []
         self.leader_url = None
+        # read routing across followers
+        self.router = NodeRouter()
+        # hedged follower queries
+        self.hedge_enabled = False
+        self.hedge_percentile = 95
+        self.hedge_min_delay = 0.05
+        self.hedge_max_delay = 1
+        self.hedge_max_workers = 16
+        self.hedge_stats = HedgeStats()
+        self.query_latencies = LatencyTracker()
+        self._hedge_executor: ThreadPoolExecutor | None = None
         # retry settings
         self.retry_total = None
         self.retry_backoff = 0
+        self.retry_backoff_max = 2
+        self.retry_status_forcelist = [413, 429, 502, 503, 504]
+        self.retry_allowed_methods = ["GET", "POST"]
+        self.retry_budget = RetryBudget()
+        # per node circuit breakers
+        self.breaker_failure_threshold = 5
+        self.breaker_open_seconds = 30
+        self.breaker_half_open_probes = 1
+        self.breakers: dict[str, CircuitBreaker] = {}
+        # connection pool settings
+        self.pool_connections = 10
+        self.pool_maxsize = 10
+        self.pool_block = False
+        self.pool_idle_timeout = 300
+        # long lived sessions (one connection pool per solr base url) shared across threads
+        self._sessions: dict[str, Session] = {}
+        self._sessions_last_used: dict[str, float] = {}
+        self._sessions_lock = threading.Lock()
+        # request compression
+        self.gzip_requests = False
+        self.gzip_min_size = 2048
+        self.gzip_level = 5
+        # bulk update body format ('json': a json list of docs, 'commands': a chunked stream of add commands)
+        self.bulk_update_format = "json"
 
         self.default_start = 0
         self.default_rows = 10
+        self.stream_chunk_size = 64 * 1024
 
         # base urls
         self.reload_url = "{url}/admin/cores?action=RELOAD&core={core}"
         self.replication_url = "{url}/{core}/replication"
         self.search_url = "{url}/{core}/query"
         self.synonyms_url = "{url}/{core}/schema/analysis/synonyms"
+        self.terms_url = "{url}/{core}/terms"
         self.update_url = "{url}/{core}/update?commit=true&overwrite=true&wt=json"
         self.bulk_update_url = "{url}/{core}/update?overwrite=true&wt=json"
 
@@ -81,71 +132,276 @@ class Solr:
         """Initialize the Solr environment."""
         self.app = app
         self.retry_total = app.config.get("SOLR_RETRY_TOTAL", 2)
-        self.retry_backoff = app.config.get("SOLR_RETRY_BACKOFF_FACTOR", 5)
+        self.retry_backoff = app.config.get("SOLR_RETRY_BACKOFF_FACTOR", 0.5)
+        self.retry_backoff_max = app.config.get("SOLR_RETRY_BACKOFF_MAX", 2)
+        self.retry_budget = RetryBudget(ratio=app.config.get("SOLR_RETRY_BUDGET_RATIO", 0.1),
+                                        min_per_second=app.config.get("SOLR_RETRY_BUDGET_MIN_PER_SECOND", 1),
+                                        window_seconds=app.config.get("SOLR_RETRY_BUDGET_WINDOW_SECONDS", 10))
+        self.breaker_failure_threshold = app.config.get("SOLR_BREAKER_FAILURE_THRESHOLD", 5)
+        self.breaker_open_seconds = app.config.get("SOLR_BREAKER_OPEN_SECONDS", 30)
+        self.breaker_half_open_probes = app.config.get("SOLR_BREAKER_HALF_OPEN_PROBES", 1)
+        self.pool_connections = app.config.get("SOLR_POOL_CONNECTIONS", 10)
+        self.pool_maxsize = app.config.get("SOLR_POOL_MAXSIZE", 10)
+        self.pool_block = app.config.get("SOLR_POOL_BLOCK", False)
+        self.pool_idle_timeout = app.config.get("SOLR_POOL_IDLE_TIMEOUT", 300)
+        self.gzip_requests = app.config.get("SOLR_GZIP_REQUESTS", False)
+        self.gzip_min_size = app.config.get("SOLR_GZIP_MIN_SIZE", 2048)
+        self.gzip_level = app.config.get("SOLR_GZIP_LEVEL", 5)
+        self.bulk_update_format = app.config.get("SOLR_BULK_UPDATE_FORMAT", "json")
         # NOTE: for a single core implementation set leader/follower cores the same
         self.leader_core = app.config.get(f"{self.config_prefix}_LEADER_CORE")
         self.follower_core = app.config.get(f"{self.config_prefix}_FOLLOWER_CORE")
         # NOTE: for a single node implementation set the leader/follower urls the same
         self.leader_url = app.config.get(f"{self.config_prefix}_LEADER_URL")
         self.follower_url = app.config.get(f"{self.config_prefix}_FOLLOWER_URL")
+        # NOTE: reads are spread across all followers if more than one is given
+        self.follower_urls = app.config.get(f"{self.config_prefix}_FOLLOWER_URLS") or [self.follower_url]
+        self.follower_url = self.follower_urls[0]
+        self.router = NodeRouter(urls=self.follower_urls,
+                                 eject_failures=app.config.get("SOLR_ROUTER_EJECT_FAILURES", 3),
+                                 eject_error_rate=app.config.get("SOLR_ROUTER_EJECT_ERROR_RATE", 0.6),
+                                 eject_seconds=app.config.get("SOLR_ROUTER_EJECT_SECONDS", 30))
+        self.hedge_enabled = app.config.get("SOLR_HEDGE_ENABLED", False)
+        self.hedge_percentile = app.config.get("SOLR_HEDGE_PERCENTILE", 95)
+        self.hedge_min_delay = app.config.get("SOLR_HEDGE_MIN_DELAY_MS", 50) / 1000
+        self.hedge_max_delay = app.config.get("SOLR_HEDGE_MAX_DELAY_MS", 1000) / 1000
+        self.hedge_max_workers = app.config.get("SOLR_HEDGE_MAX_WORKERS", 16)
+        self.breakers = {url: self._create_breaker() for url in {self.leader_url, *self.follower_urls}}
+        app.logger.info(f"Solr payloads are encoded / decoded with {json_codec.CODEC}.")
+        # drop any pools created with previous settings
+        self.close_sessions()
+
+    def _create_breaker(self) -> CircuitBreaker:
+        """Return a new circuit breaker with the configured settings."""
+        return CircuitBreaker(failure_threshold=self.breaker_failure_threshold,
+                              open_seconds=self.breaker_open_seconds,
+                              half_open_probes=self.breaker_half_open_probes)
+
+    def get_breaker(self, base_url: str) -> CircuitBreaker:
+        """Return the circuit breaker for the solr base url."""
+        if not (breaker := self.breakers.get(base_url)):
+            with self._sessions_lock:
+                breaker = self.breakers.setdefault(base_url, self._create_breaker())
+        return breaker
+
+    def _create_session(self) -> Session:
+        """Return a new session with a pooled adapter mounted for http and https."""
+        # NOTE: retries are handled in call_solr so they can be limited by the retry budget and circuit breaker
+        adapter = HTTPAdapter(max_retries=0,
+                              pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              pool_block=self.pool_block)
+        session = Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_session(self, base_url: str) -> Session:
+        """Return the shared keep-alive session for the solr base url.
+
+        Sessions idle for longer than the idle timeout are closed and replaced so stale keep-alive
+        connections (i.e. ones dropped by a load balancer) are not reused.
+        """
+        now = time.monotonic()
+        with self._sessions_lock:
+            session = self._sessions.get(base_url)
+            last_used = self._sessions_last_used.get(base_url, now)
+            if session and self.pool_idle_timeout and now - last_used > self.pool_idle_timeout:
+                session.close()
+                session = None
+            if not session:
+                session = self._create_session()
+                self._sessions[base_url] = session
+            self._sessions_last_used[base_url] = now
+            return session
+
+    def close_sessions(self):
+        """Close all pooled sessions."""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+            self._sessions_last_used = {}
+
+    def get_node(self, leader: bool, node_url: str | None = None) -> tuple[str, str]:
+        """Return the base url and core to send the request to.
 
-    def call_solr(self,  # noqa: PLR0913
+        Follower requests go to the given node or the best node picked by the router (skipping nodes with an
+        open circuit). If every follower has been ejected the request falls back to the leader.
+        """
+        if leader:
+            return self.leader_url, self.leader_core
+        open_nodes = [url for url in self.follower_urls if self.get_breaker(url).is_open()]
+        if node_url := node_url or self.router.pick(exclude=open_nodes):
+            return node_url, self.follower_core
+        current_app.logger.warning("No healthy solr followers available. Falling back to the leader.")
+        return self.leader_url, self.leader_core
+
+    def call_solr(self,  # noqa: PLR0913, PLR0917
                   method: str,
                   query: str,
                   params: dict | None = None,
                   json_data: dict | None = None,
                   xml_data: str | None = None,
                   leader=True,
-                  timeout=25) -> Response:
-        """Call solr instance with given params."""
-        base_url = self.leader_url if leader else self.follower_url
-        core = self.leader_core if leader else self.follower_core
+                  timeout=25,
+                  node_url: str | None = None,
+                  stream=False,
+                  stream_docs=False) -> Response:
+        """Call solr instance with given params.
+
+        Failed attempts are retried with a capped backoff as long as the retry budget, the circuit breaker
+        and the timeout (the deadline for the whole call) allow it. With stream=True the body is only read
+        on error (the caller is responsible for consuming / closing the response). With stream_docs=True the
+        json_data list of docs is sent as a chunked stream of solr add commands.
+        """
+        base_url, core = self.get_node(leader, node_url)
         url = query.format(url=base_url, core=core)
-        retries = Retry(total=self.retry_total,
-                        backoff_factor=self.retry_backoff,
-                        status_forcelist=[413, 429, 502, 503, 504],
-                        allowed_methods=["GET", "POST"])
-        session = Session()
-        session.mount(url, HTTPAdapter(max_retries=retries))
+        breaker = self.get_breaker(base_url)
+        if not breaker.allow_request():
+            raise SolrException(error=f"Solr circuit open for {base_url}.", status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+        session = self.get_session(base_url)
 
         response = None
+        start_time = self.router.start(base_url)
+        deadline = start_time + timeout
+        self.retry_budget.record_request()
         try:
-            if method == "GET":
-                response = session.get(url, params=params, timeout=timeout)
-            elif method == "POST" and json_data:
-                response = session.post(url=url, json=json_data, timeout=timeout)
-            elif method == "PUT" and json_data:
-                response = session.put(url=url, json=json_data, timeout=timeout)
-            elif method == "POST" and xml_data:
-                headers = {"Content-Type": "application/xml"}
-                response = session.post(url=url, data=xml_data, headers=headers, timeout=timeout)
-            else:
-                current_app.logger.debug(
-                    f"Invalid function params: {method}, {query}, {params}, {json_data}, {xml_data}")
-                raise Exception("Invalid params given.")  # pylint: disable=broad-exception-raised
+            # NOTE: encoded once up front so retries reuse the same body
+            json_body, json_headers = self.encode_body(json_data, stream_docs) if json_data else (None, {})
+            retry_count = 0
+            while True:
+                try:
+                    response = self._send(session, method, url, params, json_body, json_headers, xml_data,
+                                          timeout=max(deadline - time.monotonic(), 1), stream=stream)
+                except (SolrConnectionError, Timeout) as err:
+                    breaker.record_failure()
+                    # NOTE: a read timeout may have been processed by solr so only retry it for allowed methods
+                    idempotent_only = not isinstance(err, SolrConnectionError)
+                    if (backoff := self.get_retry_backoff(method, retry_count, deadline, breaker,
+                                                          idempotent_only)) is None:
+                        raise
+                else:
+                    if response.status_code < 500:  # noqa: PLR2004
+                        breaker.record_success()
+                    else:
+                        breaker.record_failure()
+                    if response.status_code not in self.retry_status_forcelist or (
+                            backoff := self.get_retry_backoff(method, retry_count, deadline, breaker)) is None:
+                        break
+                    # release the connection of the failed attempt
+                    response.close()
+                retry_count += 1
+                current_app.logger.debug(f"Retrying solr request ({retry_count}) in {backoff}s: {url}")
+                time.sleep(backoff)
+
             # check for error
             if response.status_code != HTTPStatus.OK:
                 error = response.json().get("error", {}).get("msg", "Error handling Solr request.")
                 raise Exception(error)  # pylint: disable=broad-exception-raised;
 
+            self.router.finish(base_url, start_time, True)
             return response
 
-        except SolrConnectionError as err:
+        except (SolrConnectionError, Timeout) as err:
+            self.router.finish(base_url, start_time, False)
             current_app.logger.debug(err.with_traceback(None))
             raise SolrException(
                 error="Connection error while handling Solr request.",
                 status_code=HTTPStatus.GATEWAY_TIMEOUT) from err
         except Exception as err:
+            # NOTE: client errors (i.e. a bad query) say nothing about the health of the node
+            client_error = response is not None and response.status_code < 500  # noqa: PLR2004
+            self.router.finish(base_url, start_time, client_error)
             current_app.logger.debug(err.with_traceback(None))
             current_app.logger.debug("method: %s, query: %s, params: %s, data: %s",
                                      method, query, params, xml_data or json_data)
-            msg = "Error handling Solr request."
-            status_code = HTTPStatus.INTERNAL_SERVER_ERROR
-            with suppress(Exception):
-                status_code = response.status_code
-                msg = response.json().get("error", {}).get("msg", msg)
-            current_app.logger.debug(msg)
-            raise SolrException(error=msg, status_code=status_code) from err
+            raise self.get_solr_exception(response) from err
+
+    @staticmethod
+    def _send(session: Session,  # noqa: PLR0913, PLR0917
+              method: str,
+              url: str,
+              params: dict | None,
+              json_body: bytes | Callable[[], Iterator[bytes]] | None,
+              json_headers: dict[str, str],
+              xml_data: str | None,
+              timeout: float,
+              stream=False) -> Response:
+        """Send a single request to solr."""
+        if method == "GET":
+            return session.get(url, params=params, timeout=timeout, stream=stream)
+        if method in ["POST", "PUT"] and json_body:
+            # NOTE: streamed bodies are recreated for each attempt
+            data = json_body() if callable(json_body) else json_body
+            return session.request(method, url=url, params=params, data=data, headers=json_headers,
+                                   timeout=timeout, stream=stream)
+        if method == "POST" and xml_data:
+            headers = {"Content-Type": "application/xml"}
+            return session.post(url=url, data=xml_data, headers=headers, timeout=timeout, stream=stream)
+        current_app.logger.debug(f"Invalid function params: {method}, {url}, {params}, {json_body}, {xml_data}")
+        raise Exception("Invalid params given.")  # pylint: disable=broad-exception-raised
+
+    def encode_body(self,
+                    json_data: dict | list,
+                    stream_docs=False) -> tuple[bytes | Callable[[], Iterator[bytes]], dict[str, str]]:
+        """Return the json request body and headers (gzipped if enabled and the body is large enough).
+
+        If stream_docs is given the body is a function returning the chunks of a solr add command stream.
+        """
+        if stream_docs:
+            headers = {"Content-Type": "application/json"}
+            if self.gzip_requests:
+                headers["Content-Encoding"] = "gzip"
+                return lambda: self._gzip_chunks(json_codec.iter_add_commands(json_data)), headers
+            return lambda: json_codec.iter_add_commands(json_data), headers
+        body = json_codec.dumps(json_data)
+        if self.gzip_requests and len(body) >= self.gzip_min_size:
+            return gzip.compress(body, compresslevel=self.gzip_level), {"Content-Type": "application/json",
+                                                                         "Content-Encoding": "gzip"}
+        return body, {"Content-Type": "application/json"}
+
+    def _gzip_chunks(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield the gzip compressed chunks."""
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            if data := compressor.compress(chunk):
+                yield data
+        yield compressor.flush()
+
+    def get_retry_backoff(self,
+                          method: str,
+                          retry_count: int,
+                          deadline: float,
+                          breaker: CircuitBreaker,
+                          idempotent_only=True) -> float | None:
+        """Return the seconds to wait before retrying or None if the request should not be retried."""
+        if retry_count >= self.retry_total or (idempotent_only and method not in self.retry_allowed_methods):
+            return None
+        backoff = self.get_backoff_time(retry_count + 1)
+        if time.monotonic() + backoff >= deadline or breaker.is_open():
+            return None
+        if not self.retry_budget.can_retry():
+            current_app.logger.debug("Solr retry budget exhausted.")
+            return None
+        return backoff
+
+    def get_backoff_time(self, retry_count: int) -> float:
+        """Return the seconds to wait before the given retry (matches the urllib3 Retry backoff)."""
+        if retry_count <= 1:
+            return 0
+        return min(self.retry_backoff_max, self.retry_backoff * (2 ** (retry_count - 1)))
+
+    @staticmethod
+    def get_solr_exception(response) -> SolrException:
+        """Return the SolrException for the failed response (if there was one)."""
+        msg = "Error handling Solr request."
+        status_code = HTTPStatus.INTERNAL_SERVER_ERROR
+        with suppress(Exception):
+            status_code = response.status_code
+            msg = response.json().get("error", {}).get("msg", msg)
+        current_app.logger.debug(msg)
+        return SolrException(error=msg, status_code=status_code)
 
     def create_or_update_synonyms(self, synonym_type: BaseEnum, synonyms: dict[str: list[str]]):
         """Create or update solr docs in the core."""
@@ -169,12 +425,97 @@ class Solr:
         response = self.call_solr("POST", self.update_url, xml_data=payload, timeout=60)
         return response
 
-    def query(self, payload: dict[str, str], start: int | None = None, rows: int | None = None) -> dict:
-        """Return a list of solr docs from the solr query handler for the given params."""
+    def query(self,
+              payload: dict[str, str],
+              start: int | None = None,
+              rows: int | None = None,
+              use_params: str | None = None) -> dict:
+        """Return a list of solr docs from the solr query handler for the given params.
+
+        use_params is the name of the paramset (search profile) the query references.
+        """
         payload["offset"] = start if start else self.default_start
         payload["limit"] = rows if rows else self.default_rows
-        response = self.call_solr("POST", self.search_url, json_data=payload, leader=False)
-        return response.json()
+        params = {"useParams": use_params} if use_params else None
+        start_time = time.monotonic()
+        if self.hedge_enabled and len(self.follower_urls) > 1 and (primary_node := self.router.pick()):
+            response = hedged_call(executor=self._get_hedge_executor(),
+                                   call=lambda node_url: self._call_in_app_context(
+                                       "POST", self.search_url, params=params, json_data=payload, leader=False,
+                                       node_url=node_url),
+                                   primary_node=primary_node,
+                                   pick_hedge_node=lambda exclude: self.router.pick(exclude=exclude),
+                                   delay=self.get_hedge_delay(),
+                                   stats=self.hedge_stats)
+        else:
+            response = self.call_solr("POST", self.search_url, params=params, json_data=payload, leader=False)
+        self.query_latencies.record(time.monotonic() - start_time)
+        return json_codec.loads(response.content)
+
+    def query_stream(self,
+                     payload: dict[str, str],
+                     start: int | None = None,
+                     rows: int | None = None,
+                     use_params: str | None = None) -> SolrDocStream:
+        """Return a stream of the solr docs from the solr query handler for the given params.
+
+        Docs are parsed as they are received instead of loading the whole response (the other response values
+        are available in the stream meta).
+        """
+        payload["offset"] = start if start else self.default_start
+        payload["limit"] = rows if rows else self.default_rows
+        params = {"useParams": use_params} if use_params else None
+        response = self.call_solr("POST", self.search_url, params=params, json_data=payload, leader=False,
+                                  stream=True)
+        try:
+            return SolrDocStream(response.iter_content(chunk_size=self.stream_chunk_size), on_close=response.close)
+        except Exception as err:
+            response.close()
+            current_app.logger.debug(err.with_traceback(None))
+            raise SolrException(error="Error parsing Solr response.",
+                                status_code=HTTPStatus.INTERNAL_SERVER_ERROR) from err
+
+    def iter_cursor(self, payload: dict, unique_key: str, rows: int = 1000) -> Iterator[dict]:
+        """Yield every solr doc matching the query, paging with a cursorMark instead of an offset.
+
+        The unique key is added to the sort as required by solr for cursors. Each page is streamed.
+        """
+        sort = payload.get("sort")
+        if not sort or unique_key not in sort:
+            sort = f"{sort}, {unique_key} asc" if sort else f"{unique_key} asc"
+        cursor_mark = "*"
+        while True:
+            page_payload = {
+                **payload,
+                "sort": sort,
+                "params": {**payload.get("params", {}), "cursorMark": cursor_mark}
+            }
+            with self.query_stream(page_payload, rows=rows) as docs:
+                yield from docs
+                next_cursor_mark = docs.meta.get("nextCursorMark")
+            # NOTE: solr returns the same cursorMark once all docs have been returned
+            if not next_cursor_mark or next_cursor_mark == cursor_mark:
+                return
+            cursor_mark = next_cursor_mark
+
+    def get_hedge_delay(self) -> float:
+        """Return the seconds to wait on the first follower before sending a hedged request."""
+        if (delay := self.query_latencies.percentile(self.hedge_percentile)) is None:
+            return self.hedge_max_delay
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """Return the executor used for the hedge requests (the primary requests are sent inline)."""
+        with self._sessions_lock:
+            if not self._hedge_executor:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.hedge_max_workers,
+                                                          thread_name_prefix="solr-hedge")
+            return self._hedge_executor
+
+    def _call_in_app_context(self, *args, **kwargs) -> Response:
+        """Return call_solr from a worker thread."""
+        with self.app.app_context():
+            return self.call_solr(*args, **kwargs)
 
     def reload_core(self):
         """Reload the solr core."""
@@ -183,12 +524,36 @@ class Solr:
         current_app.logger.info("Core reloaded.")
         return reload
 
-    def replication(self, command: str, leader=True):
-        """Send a replication command to solr."""
-        current_app.logger.info(f'Sending {command} command to {"leader" if leader else "follower"}')
-        resp = self.call_solr(method="GET",
-                              query=self.replication_url,
-                              params={"command": command},
-                              leader=leader)
-        current_app.logger.info(f"{command} command executed.")
+    def replication(self, command: str, leader=True, node_url: str | None = None):
+        """Send a replication command to solr.
+
+        Follower commands are sent to every follower unless a specific node is given (returns the last response).
+        """
+        if leader or node_url:
+            current_app.logger.info(f'Sending {command} command to {"leader" if leader else node_url}')
+            resp = self.call_solr(method="GET",
+                                  query=self.replication_url,
+                                  params={"command": command},
+                                  leader=leader,
+                                  node_url=node_url)
+            current_app.logger.info(f"{command} command executed.")
+            return resp
+
+        resp = None
+        for follower_url in self.follower_urls:
+            resp = self.replication(command, False, follower_url)
         return resp
+
+    def get_index_version(self) -> str:
+        """Return the replicated index version of the followers (changes whenever a follower fetches a new index)."""
+        versions = []
+        for follower_url in self.follower_urls:
+            resp = self.call_solr(method="GET",
+                                  query=self.replication_url,
+                                  params={"command": "indexversion"},
+                                  leader=False,
+                                  timeout=5,
+                                  node_url=follower_url)
+            details = json_codec.loads(resp.content)
+            versions.append(f'{details.get("indexversion")}.{details.get("generation")}')
+        return "-".join(versions)
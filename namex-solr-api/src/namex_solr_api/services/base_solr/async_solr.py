@@ -0,0 +1,215 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""This module wraps the solr classes/fields for using solr from asyncio code."""
+from __future__ import annotations
+
+import asyncio
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import httpx
+from flask import current_app
+
+from namex_solr_api.exceptions import SolrException
+
+from .utils import json_codec
+
+if TYPE_CHECKING:
+    from namex_solr_api.common.base_enum import BaseEnum
+
+    from . import Solr
+    from .utils.circuit_breaker import CircuitBreaker
+
+
+class AsyncSolr:
+    """Asyncio counterpart of the Solr wrapper class.
+
+    Uses the urls, cores and retry settings of the given (initialized) Solr instance and raises the
+    same SolrException errors as Solr.call_solr. The http client is bound to the event loop it is first
+    used in, so close it before that loop ends.
+    """
+
+    def __init__(self, solr: Solr):
+        """Initialize the async solr class."""
+        self.solr = solr
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled http client (created on first use so it picks up the initialized settings)."""
+        if not self._client:
+            # NOTE: retries are handled in call_solr so they can be limited by the retry budget and circuit breaker
+            self._client = httpx.AsyncClient(limits=httpx.Limits(max_connections=self.solr.pool_maxsize,
+                                                                 max_keepalive_connections=self.solr.pool_maxsize,
+                                                                 keepalive_expiry=self.solr.pool_idle_timeout))
+        return self._client
+
+    async def close(self):
+        """Close the http client and its pooled connections."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request_with_retries(self,  # noqa: PLR0913, PLR0917
+                                    method: str,
+                                    url: str,
+                                    params: dict | None,
+                                    data: bytes | None,
+                                    headers: dict[str, str],
+                                    deadline: float,
+                                    breaker: CircuitBreaker) -> httpx.Response:
+        """Return the response, retrying failed attempts within the same limits as Solr.call_solr."""
+        retry_count = 0
+        while True:
+            try:
+                response = await self.client.request(method, url, params=params, content=data, headers=headers,
+                                                     timeout=max(deadline - time.monotonic(), 1))
+            except httpx.TransportError as err:
+                breaker.record_failure()
+                # NOTE: only errors raised before the request was sent are safe to retry for any method
+                idempotent_only = not isinstance(err, httpx.ConnectError | httpx.ConnectTimeout | httpx.PoolTimeout)
+                if (backoff := self.solr.get_retry_backoff(method, retry_count, deadline, breaker,
+                                                           idempotent_only)) is None:
+                    raise
+            else:
+                if response.status_code < 500:  # noqa: PLR2004
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                if response.status_code not in self.solr.retry_status_forcelist or (
+                        backoff := self.solr.get_retry_backoff(method, retry_count, deadline, breaker)) is None:
+                    return response
+            retry_count += 1
+            await asyncio.sleep(backoff)
+
+    async def call_solr(self,  # noqa: PLR0913, PLR0917
+                        method: str,
+                        query: str,
+                        params: dict | None = None,
+                        json_data: dict | list | None = None,
+                        xml_data: str | None = None,
+                        leader=True,
+                        timeout=25,
+                        node_url: str | None = None) -> httpx.Response:
+        """Call solr instance with given params."""
+        base_url, core = self.solr.get_node(leader, node_url)
+        url = query.format(url=base_url, core=core)
+        breaker = self.solr.get_breaker(base_url)
+        if not breaker.allow_request():
+            raise SolrException(error=f"Solr circuit open for {base_url}.", status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+
+        response = None
+        start_time = self.solr.router.start(base_url)
+        self.solr.retry_budget.record_request()
+        try:
+            if method == "GET":
+                data, headers = None, {}
+            elif method in ["POST", "PUT"] and json_data:
+                data, headers = self.solr.encode_body(json_data)
+            elif method == "POST" and xml_data:
+                data, headers = xml_data.encode(), {"Content-Type": "application/xml"}
+            else:
+                current_app.logger.debug(
+                    f"Invalid function params: {method}, {query}, {params}, {json_data}, {xml_data}")
+                raise Exception("Invalid params given.")  # pylint: disable=broad-exception-raised
+
+            response = await self._request_with_retries(method, url, params, data, headers,
+                                                        start_time + timeout, breaker)
+            # check for error
+            if response.status_code != HTTPStatus.OK:
+                error = response.json().get("error", {}).get("msg", "Error handling Solr request.")
+                raise Exception(error)  # pylint: disable=broad-exception-raised;
+
+            self.solr.router.finish(base_url, start_time, True)
+            return response
+
+        except httpx.TransportError as err:
+            self.solr.router.finish(base_url, start_time, False)
+            current_app.logger.debug(err.with_traceback(None))
+            raise SolrException(
+                error="Connection error while handling Solr request.",
+                status_code=HTTPStatus.GATEWAY_TIMEOUT) from err
+        except Exception as err:
+            # NOTE: client errors (i.e. a bad query) say nothing about the health of the node
+            client_error = response is not None and response.status_code < 500  # noqa: PLR2004
+            self.solr.router.finish(base_url, start_time, client_error)
+            current_app.logger.debug(err.with_traceback(None))
+            current_app.logger.debug("method: %s, query: %s, params: %s, data: %s",
+                                     method, query, params, xml_data or json_data)
+            raise self.solr.get_solr_exception(response) from err
+
+    async def create_or_update_synonyms(self, synonym_type: BaseEnum, synonyms: dict[str: list[str]]):
+        """Create or update solr docs in the core."""
+        return await self.call_solr("PUT",
+                                    f"{self.solr.synonyms_url}/{synonym_type.value}",
+                                    json_data=synonyms,
+                                    timeout=180)
+
+    async def query(self,
+                    payload: dict[str, str],
+                    start: int | None = None,
+                    rows: int | None = None,
+                    use_params: str | None = None) -> dict:
+        """Return a list of solr docs from the solr query handler for the given params."""
+        payload["offset"] = start if start else self.solr.default_start
+        payload["limit"] = rows if rows else self.solr.default_rows
+        params = {"useParams": use_params} if use_params else None
+        response = await self.call_solr("POST", self.solr.search_url, params=params, json_data=payload, leader=False)
+        return json_codec.loads(response.content)
+
+    async def reload_core(self):
+        """Reload the solr core."""
+        current_app.logger.info("Reloading core...")
+        reload = await self.call_solr(method="GET", query=self.solr.reload_url)
+        current_app.logger.info("Core reloaded.")
+        return reload
+
+    async def replication(self, command: str, leader=True, node_url: str | None = None):
+        """Send a replication command to solr.
+
+        Follower commands are sent to every follower unless a specific node is given (returns the last response).
+        """
+        if leader or node_url:
+            current_app.logger.info(f'Sending {command} command to {"leader" if leader else node_url}')
+            resp = await self.call_solr(method="GET",
+                                        query=self.solr.replication_url,
+                                        params={"command": command},
+                                        leader=leader,
+                                        node_url=node_url)
+            current_app.logger.info(f"{command} command executed.")
+            return resp
+
+        resps = await asyncio.gather(*[self.replication(command, False, url) for url in self.solr.follower_urls])
+        return resps[-1]
@@ -32,6 +32,6 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """This module manages helpful util functions for using the solr service."""
-from .formatting_helpers import parse_facets, prep_query_str
+from .formatting_helpers import parse_facets, prep_query_str, prep_query_str_variants
 from .query_builder import QueryBuilder
 from .query_params import QueryParams
@@ -0,0 +1,174 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Circuit breaker and retry budget used to fail fast when solr is degraded."""
+import threading
+from collections import deque
+from time import monotonic
+
+from namex_solr_api.common.base_enum import BaseEnum
+
+
+class CircuitBreaker:
+    """Per node circuit breaker.
+
+    CLOSED: requests flow, consecutive failures are counted and the breaker opens at the threshold.
+    OPEN: requests are rejected until the open period has passed.
+    HALF_OPEN: a limited number of probe requests are let through; a success closes the breaker and a
+    failure opens it again.
+    """
+
+    class State(BaseEnum):
+        """Enum of the circuit breaker states."""
+
+        CLOSED = "closed"
+        OPEN = "open"
+        HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, open_seconds: float = 30, half_open_probes: int = 1):
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CircuitBreaker.State.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.trips = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Return True if requests would currently be rejected."""
+        with self._lock:
+            return self.state == CircuitBreaker.State.OPEN and monotonic() - self.opened_at < self.open_seconds
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent (reserves a probe slot when half open)."""
+        with self._lock:
+            now = monotonic()
+            if self.state != CircuitBreaker.State.CLOSED and now - self.opened_at >= self.open_seconds:
+                # NOTE: also frees up probe slots that were never resolved
+                self.state = CircuitBreaker.State.HALF_OPEN
+                self.opened_at = now
+                self.probes_in_flight = 0
+            if self.state == CircuitBreaker.State.CLOSED:
+                return True
+            if self.state == CircuitBreaker.State.HALF_OPEN and self.probes_in_flight < self.half_open_probes:
+                self.probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a successful request."""
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state == CircuitBreaker.State.HALF_OPEN:
+                self.state = CircuitBreaker.State.CLOSED
+                self.probes_in_flight = 0
+
+    def record_failure(self):
+        """Record a failed request."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == CircuitBreaker.State.HALF_OPEN or (
+                    self.state == CircuitBreaker.State.CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self.state = CircuitBreaker.State.OPEN
+                self.opened_at = monotonic()
+                self.probes_in_flight = 0
+                self.trips += 1
+
+    def to_dict(self) -> dict:
+        """Return the breaker state and counters."""
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "consecutiveFailures": self.consecutive_failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+class RetryBudget:
+    """Limits retries to a fraction of the requests sent over a sliding window.
+
+    A minimum number of retries per second is always allowed so low traffic can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1, window_seconds: float = 10):
+        """Initialize the budget."""
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window_seconds = window_seconds
+        self.exhausted = 0
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float):
+        """Drop entries older than the window."""
+        for entries in (self._requests, self._retries):
+            while entries and now - entries[0] > self.window_seconds:
+                entries.popleft()
+
+    def record_request(self):
+        """Record a (non retry) request."""
+        now = monotonic()
+        with self._lock:
+            self._trim(now)
+            self._requests.append(now)
+
+    def can_retry(self) -> bool:
+        """Return True and record the retry if there is budget left for it."""
+        now = monotonic()
+        with self._lock:
+            self._trim(now)
+            allowed = max(self.min_per_second * self.window_seconds, self.ratio * len(self._requests))
+            if len(self._retries) >= allowed:
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def to_dict(self) -> dict:
+        """Return the budget counters."""
+        with self._lock:
+            self._trim(monotonic())
+            return {
+                "requests": len(self._requests),
+                "retries": len(self._retries),
+                "exhausted": self.exhausted,
+                "ratio": self.ratio,
+                "windowSeconds": self.window_seconds,
+            }
@@ -33,6 +33,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Solr formatting functions."""
 import re
+from collections.abc import Iterable
 
 
 def parse_facets(facet_data: dict) -> dict:
@@ -51,6 +52,23 @@ def parse_facets(facet_data: dict) -> dict:
 
     return {"fields": facets}
 
+# NOTE: compiled / built once as these are run several times per search request
+_RMV_DOUBLES = re.compile(r"([&+]){2,}")
+_PAD_DASH = re.compile(r"(\S)(-)(\S)")
+_TIGHTEN_DASH = re.compile(r"(\s+)(-)(\s+)")
+_ESC_BEGIN = re.compile(r"(^|\s)([+\-/!])")
+# single pass character translations (remove, replace and, replace / remove dash, escape everywhere)
+_RMV_ALL = dict.fromkeys(map(ord, "()^{}|\\"))
+_SPECIAL_AND = dict.fromkeys(map(ord, "&+"), " and ")
+_DASH = {"replace": {ord("-"): " "}, "remove": {ord("-"): None}}
+_ESC_ALL = str.maketrans({char: f"\\{char}" for char in ':~<>?"[]'})
+_TRANSLATIONS = {
+    (replace_and, dash): str.maketrans({**_RMV_ALL, **(_SPECIAL_AND if replace_and else {}), **_DASH.get(dash, {})})
+    for replace_and in [True, False]
+    for dash in [None, *_DASH]
+}
+
+
 def prep_query_str(query: str, dash: str | None = None, replace_and = True) -> str:
     r"""Return the query string prepped for solr call.
 
@@ -67,31 +85,41 @@ def prep_query_str(query: str, dash: str | None = None, replace_and = True) -> s
     if not query:
         return ""
 
-    rmv_doubles = r"([&+]){2,}"
-    rmv_all = r"([()^{}|\\])"
-    esc_begin = r"(^|\s)([+\-/!])"
-    esc_all = r'([:~<>?\"\[\]])'
-    special_and = r"([&+])"
-    rmv_dash = r"(-)"
-    pad_dash = r"(\S)(-)(\S)"
-    tighten_dash = r"(\s+)(-)(\s+)"
+    return prep_query_str_variants(query, [dash], replace_and)[dash]
+
+
+def prep_query_str_variants(query: str, dashes: Iterable[str | None], replace_and = True) -> dict[str | None, str]:
+    """Return the prepped query string for each of the dash options (see prep_query_str).
+
+    The steps shared between the variants are only run once.
+    """
+    if not query:
+        return dict.fromkeys(dashes, "")
+
+    # NOTE: the regexes are skipped when the query has none of the characters they match on
+    query = query.lower()
+    if "&" in query or "+" in query:
+        query = _RMV_DOUBLES.sub(r"\1", query)
 
-    query = re.sub(rmv_doubles, r"\1", query.lower())
-    query = re.sub(rmv_all, "", query)
-    if replace_and:
-        query = re.sub(special_and, r" and ", query)
-    if dash:
-        if dash == "replace":
-            query = re.sub(rmv_dash, r" ", query)
-        if dash == "remove":
-            query = re.sub(rmv_dash, r"", query)
-        if dash == "pad":
-            query = re.sub(pad_dash, r"\1 \2 \3", query)
-        if dash == "tighten":
-            query = re.sub(tighten_dash, r"\2", query)
-        if dash == "tighten-remove":
-            query = re.sub(tighten_dash, r"", query)
+    translated: dict[str | None, str] = {}
+    finalized: dict[str, str] = {}
+    variants: dict[str | None, str] = {}
+    for dash in dashes:
+        translate_dash = dash if dash in _DASH else None
+        if (variant := translated.get(translate_dash)) is None:
+            variant = translated[translate_dash] = query.translate(_TRANSLATIONS[(bool(replace_and), translate_dash)])
+        if "-" in variant:
+            if dash == "pad":
+                variant = _PAD_DASH.sub(r"\1 \2 \3", variant)
+            elif dash == "tighten":
+                variant = _TIGHTEN_DASH.sub(r"\2", variant)
+            elif dash == "tighten-remove":
+                variant = _TIGHTEN_DASH.sub(r"", variant)
 
-    query = re.sub(esc_begin, r"\1\\\2", query)
-    query = re.sub(esc_all, r"\\\1", query)
-    return query.lower().replace("  ", " ").strip()
+        if (result := finalized.get(variant)) is None:
+            result = variant
+            if "+" in result or "-" in result or "/" in result or "!" in result:
+                result = _ESC_BEGIN.sub(r"\1\\\2", result)
+            result = finalized[variant] = result.translate(_ESC_ALL).lower().replace("  ", " ").strip()
+        variants[dash] = result
+    return variants
@@ -0,0 +1,139 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Request hedging helpers for read only solr calls."""
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+
+
+class LatencyTracker:
+    """Keeps a window of recent request latencies to derive the hedge delay from."""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        """Initialize the tracker."""
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        """Record a request latency (seconds)."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the latency at the given percentile (None until there are enough samples)."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * percentile / 100), len(latencies) - 1)
+        return latencies[index]
+
+
+class HedgeStats:
+    """Thread safe counters for hedged requests."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+
+    def incr(self, counter: str):
+        """Increment the counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self) -> dict:
+        """Return the counters as a dict."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedgeWins": self.hedge_wins,
+                "primaryWins": self.primary_wins,
+            }
+
+
+def hedged_call(executor: ThreadPoolExecutor,  # noqa: PLR0913, PLR0917
+                call: Callable[[str], object],
+                primary_node: str,
+                pick_hedge_node: Callable[[list[str]], str | None],
+                delay: float,
+                stats: HedgeStats):
+    """Return the result of call(primary_node), hedging to a second node if it is slow or fails.
+
+    The primary is called inline and only the hedge goes through the executor, so a busy executor delays or
+    skips hedges instead of queuing the searches. The hedge is sent if the primary has not answered within the
+    delay (or failed before it). A successful primary result is returned as soon as it arrives (an in flight
+    hedge can not be interrupted so its result is discarded). If the primary fails the hedge result is used
+    and if both fail the primary error is raised.
+    """
+    stats.incr("requests")
+    primary_done = threading.Event()
+    primary_failed = threading.Event()
+    hedge_sent = threading.Event()
+
+    def hedge():
+        """Call the hedge node if the primary is slow or failed (returns None if no hedge was sent)."""
+        if primary_done.wait(delay) and not primary_failed.is_set():
+            return None
+        if not (hedge_node := pick_hedge_node([primary_node])):
+            return None
+        hedge_sent.set()
+        stats.incr("hedges")
+        return call(hedge_node)
+
+    hedge_future: Future = executor.submit(hedge)
+    try:
+        result = call(primary_node)
+    except Exception:
+        primary_failed.set()
+        primary_done.set()
+        with suppress(Exception):
+            # NOTE: a hedge still queued behind other work is sent from this thread instead
+            hedge_result = hedge() if hedge_future.cancel() else hedge_future.result()
+            if hedge_result is not None:
+                stats.incr("hedge_wins")
+                return hedge_result
+        raise
+    primary_done.set()
+    hedge_future.cancel()
+    if hedge_sent.is_set():
+        stats.incr("primary_wins")
+    return result
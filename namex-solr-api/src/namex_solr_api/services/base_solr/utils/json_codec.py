@@ -0,0 +1,82 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""JSON encoding / decoding of solr payloads.
+
+Uses orjson when it is installed (serializes dataclasses and datetimes natively) and falls back to the
+standard library json module otherwise.
+"""
+import json
+from collections.abc import Iterator, Sequence
+from dataclasses import is_dataclass
+from datetime import date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# name of the json library in use (logged on startup)
+CODEC = "orjson" if orjson else "json"
+
+
+def _default(obj):
+    """Return a json serializable version of the object (dataclasses are serialized without copying)."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return vars(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Return the object encoded as json."""
+    if orjson:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: bytes | str):
+    """Return the decoded json."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def iter_add_commands(docs: Sequence, batch_size: int = 100) -> Iterator[bytes]:
+    """Yield the docs encoded as a stream of solr json update commands ({"add": {"doc": ...}, "add": ...})."""
+    yield b"{"
+    for start in range(0, len(docs), batch_size):
+        commands = b",".join(b'"add":{"doc":' + dumps(doc) + b"}" for doc in docs[start:start + batch_size])
+        yield b"," + commands if start else commands
+    yield b"}"
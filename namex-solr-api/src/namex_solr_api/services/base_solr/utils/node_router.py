@@ -0,0 +1,151 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Health weighted routing of read requests across solr follower nodes."""
+import random
+import threading
+from dataclasses import dataclass
+from time import monotonic
+
+
+@dataclass
+class SolrNode:
+    """Class representation of the tracked health of a solr node."""
+
+    url: str
+    ewma_latency: float | None = None  # seconds
+    error_rate: float = 0  # ewma of failures (0 - 1)
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0
+    total_requests: int = 0
+    total_failures: int = 0
+    total_ejections: int = 0
+
+    def is_ejected(self, now: float) -> bool:
+        """Return True if the node is currently ejected."""
+        return now < self.ejected_until
+
+    def score(self, default_latency: float) -> float:
+        """Return the routing score of the node (lower is better)."""
+        latency = self.ewma_latency if self.ewma_latency is not None else default_latency
+        return latency * (self.outstanding + 1) / max(1 - self.error_rate, 0.05)
+
+
+class NodeRouter:
+    """Picks the best follower for each read by EWMA latency, outstanding requests and error rate.
+
+    Nodes are ejected for a cooldown period after consecutive failures or a high error rate. When every
+    node is ejected no node is returned so the caller can fall back to the leader.
+    """
+
+    def __init__(self,
+                 urls: list[str] | None = None,
+                 decay: float = 0.3,
+                 eject_failures: int = 3,
+                 eject_error_rate: float = 0.6,
+                 eject_seconds: float = 30):
+        """Initialize the router."""
+        self.decay = decay
+        self.eject_failures = eject_failures
+        self.eject_error_rate = eject_error_rate
+        self.eject_seconds = eject_seconds
+        self._lock = threading.Lock()
+        self.nodes: dict[str, SolrNode] = {url: SolrNode(url=url) for url in urls or []}
+
+    def __contains__(self, url: str) -> bool:
+        """Return True if the url is a tracked node."""
+        return url in self.nodes
+
+    def pick(self, exclude: list[str] | None = None) -> str | None:
+        """Return the url of the best available node (None if there are no healthy nodes)."""
+        now = monotonic()
+        with self._lock:
+            candidates = [node for node in self.nodes.values()
+                          if not node.is_ejected(now) and node.url not in (exclude or [])]
+            if not candidates:
+                return None
+            known = [node.ewma_latency for node in candidates if node.ewma_latency is not None]
+            # untried nodes get the best known latency so they are picked up quickly
+            default_latency = min(known) if known else 0.001
+            best_score = min(node.score(default_latency) for node in candidates)
+            best = [node for node in candidates if node.score(default_latency) == best_score]
+            return random.choice(best).url
+
+    def start(self, url: str) -> float:
+        """Record the start of a request to the node and return the start time."""
+        with self._lock:
+            if node := self.nodes.get(url):
+                node.outstanding += 1
+                node.total_requests += 1
+        return monotonic()
+
+    def finish(self, url: str, start_time: float, success: bool):
+        """Record the outcome of a request to the node."""
+        now = monotonic()
+        with self._lock:
+            if not (node := self.nodes.get(url)):
+                return
+            node.outstanding = max(node.outstanding - 1, 0)
+            node.error_rate = (1 - self.decay) * node.error_rate + self.decay * (0 if success else 1)
+            if success:
+                latency = now - start_time
+                node.ewma_latency = latency if node.ewma_latency is None else (
+                    (1 - self.decay) * node.ewma_latency + self.decay * latency)
+                node.consecutive_failures = 0
+                return
+
+            node.total_failures += 1
+            node.consecutive_failures += 1
+            if (node.consecutive_failures >= self.eject_failures or node.error_rate >= self.eject_error_rate) \
+                    and not node.is_ejected(now):
+                node.ejected_until = now + self.eject_seconds
+                node.total_ejections += 1
+                # give the node a clean slate when it comes back
+                node.consecutive_failures = 0
+                node.error_rate = 0
+
+    def stats(self) -> list[dict]:
+        """Return the current state of each node."""
+        now = monotonic()
+        with self._lock:
+            return [{
+                "url": node.url,
+                "ejected": node.is_ejected(now),
+                "ewmaLatencyMs": round(node.ewma_latency * 1000, 2) if node.ewma_latency is not None else None,
+                "errorRate": round(node.error_rate, 3),
+                "outstanding": node.outstanding,
+                "totalRequests": node.total_requests,
+                "totalFailures": node.total_failures,
+                "totalEjections": node.total_ejections,
+            } for node in self.nodes.values()]
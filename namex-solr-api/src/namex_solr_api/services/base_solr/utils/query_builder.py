@@ -33,8 +33,25 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Manages common solr query building methods."""
 import re
+import threading
+from functools import partial
+from http import HTTPStatus
+from time import monotonic
+from typing import TYPE_CHECKING
 
 from namex_solr_api.common.base_enum import BaseEnum
+from namex_solr_api.common.ttl_cache import TTLCache
+from namex_solr_api.exceptions import BusinessException
+
+from .query_clause import ClauseGroup, FieldClause, RawClause
+from .synonym_trie import SynonymTrie
+from .term_stats import TermStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# separates the values of terms filters (a control character can't be part of a category value)
+TERMS_SEPARATOR = "\x1f"
 
 
 class QueryBuilder:
@@ -50,9 +67,35 @@ class QueryBuilder:
         self.pre_child_filter_clause = "{!parent which=\"" + unique_parent_field.value + ":*\"}"
         self.pre_parent_filter_clause = "{!child of=\"" + unique_parent_field.value + ":*\"}"
         self.synonym_field_map = synonym_field_map
+        # built base queries (cleared when the synonyms change)
+        self.base_query_cache = TTLCache()
+        # synonym phrases by synonym type (reloaded from the db when the synonyms change or after the ttl)
+        self.synonym_trie_ttl = 300
+        self._synonym_tries: dict[BaseEnum, tuple[SynonymTrie, float]] = {}
+        # complexity budget (queries over it are degraded to fit or rejected when they can't be)
+        self.max_clauses = 300
+        self.max_fuzzy_clauses = 40
+        # indexed term doc frequencies used to skip / tighten fuzzy matching (reloaded after the ttl)
+        self.term_stats_loader: Callable[[], dict[str, int] | None] | None = None
+        self.term_stats_ttl = 3600
+        self.fuzzy_common_doc_freq = 10000
+        self.fuzzy_dense_prefix_terms = 50
+        self._term_stats: tuple[TermStats, float] | None = None
+        self._term_stats_loading = False
+        self._term_stats_lock = threading.Lock()
 
     def create_clause(self, field_value: str, term: str, is_child: bool, is_child_search: bool) -> str:
         """Return the query clause for the field and term."""
+        return self.create_clause_node(field_value, term, is_child, is_child_search).serialize()
+
+    def create_clause_node(self,  # noqa: PLR0913, PLR0917
+                           field_value: str,
+                           term: str,
+                           is_child: bool,
+                           is_child_search: bool,
+                           boost: int | None = None,
+                           fuzzy: int | None = None) -> FieldClause | RawClause:
+        """Return the query clause node for the field and term."""
         corp_prefix_regex = r"(^[aA-zZ]+)[0-9]+$"
 
         search_field = field_value
@@ -65,9 +108,14 @@ class QueryBuilder:
             prefix = identifier.group(1)
             no_prefix_term = term.replace(prefix, "", 1)
 
-            return f'({search_field}:"{no_prefix_term}" AND {search_field}:"{prefix.upper()}")'
+            clause = f'({search_field}:"{no_prefix_term}" AND {search_field}:"{prefix.upper()}")'
+            if fuzzy is not None:
+                clause += f"~{fuzzy}"
+            if boost:
+                clause += f"^{boost}"
+            return RawClause(clause)
 
-        return f"{search_field}:{term}"
+        return FieldClause(search_field, term, boost, fuzzy)
 
     def build_filter_clause(self, query: dict[str, str], is_child_search: bool) -> list[str]:
         """Return the filters for the query."""
@@ -108,18 +156,24 @@ class QueryBuilder:
                           values: list[str],
                           is_child: bool,
                           is_child_search: bool) -> str:
-        """Return the facet filter clause for the given params."""
+        """Return the facet filter clause for the given params.
+
+        The values are sorted / deduped terms so the same filter is always sent in the same form (solr
+        filterCache hits) and parsed as a single terms query instead of a boolean query. The values are sent
+        as is (the terms parser does not unescape them) split by a control character instead of commas.
+        """
+        if any(TERMS_SEPARATOR in value for value in values):
+            raise BusinessException(error=f"Invalid {field.value} category value.",
+                                    message="Invalid category value.",
+                                    status_code=HTTPStatus.BAD_REQUEST)
         filter_q = ''
         if is_child and not is_child_search:
             filter_q = self.pre_child_filter_clause
         elif not is_child and is_child_search:
             filter_q = self.pre_parent_filter_clause
-        filter_q += f'{field.value}:("{values[0]}"'
-        for val in values[1:]:
-            filter_q += f' OR "{val}"'
-        filter_q += ")"
-        return filter_q
-    
+        return filter_q + f'{{!terms f={field.value} separator="{TERMS_SEPARATOR}"}}' + TERMS_SEPARATOR.join(
+            sorted(set(values)))
+
     def build_term_clause(
         self,
         term: str,
@@ -127,35 +181,31 @@ class QueryBuilder:
         boost_fields: dict[BaseEnum, int],
         fuzzy_fields: dict[BaseEnum, dict[str, int]],
         is_child_search: bool
-    ) -> str:
+    ) -> ClauseGroup:
         """Return the base term clause."""
-        term_clause = ""
+        term_clause = ClauseGroup("OR")
         for field, level in fields.items():
-            field_clause = self.create_clause(field.value, term, level == "child", is_child_search)
-            pre_boost_clause = field_clause
-            # add boost
-            if field in boost_fields:
-                field_clause += f"^{boost_fields[field]}"
-
-            term_clause = self.join_clause(term_clause, field_clause, "OR")
+            # add with boost
+            term_clause.add(self.create_clause_node(field.value, term, level == "child", is_child_search,
+                                                    boost=boost_fields.get(field)))
             # add fuzzy matching
-            if field in fuzzy_fields and (fuzzy_str := self.get_fuzzy_str(term,
-                                          fuzzy_fields[field]["short"],
-                                          fuzzy_fields[field]["long"])):
+            if field in fuzzy_fields and (
+                    fuzzy := self.get_term_fuzzy_distance(term, fuzzy_fields[field])) is not None:
                 # add another with fuzzy (this one will give a lower score on a hit if the original has a boost)
-                term_clause = self.join_clause(term_clause, f"{pre_boost_clause}{fuzzy_str}", "OR")
+                term_clause.add(self.create_clause_node(field.value, term, level == "child", is_child_search,
+                                                        fuzzy=fuzzy))
         return term_clause
 
-    def build_term_synonym_clauses(  # noqa: PLR0913
+    def build_term_synonym_clauses(  # noqa: PLR0913, PLR0917
         self,
-        term_clause: str,
+        term_clause: ClauseGroup,
         terms: list[str],
         term_index: int,
         synonym_info: dict,
         synonym_fields: dict[BaseEnum, str],
         is_child_search: bool,
         boost_fields: dict[BaseEnum, int]
-    ):
+    ) -> ClauseGroup:
         """Return the term clause with the added synonym clauses."""
         term = terms[term_index]
         for field, level in synonym_fields.items():
@@ -182,70 +232,240 @@ class QueryBuilder:
             if synonym_clause:
                 if field in boost_fields:
                     synonym_clause += f"^{boost_fields[field]}"
-                term_clause = self.join_clause(term_clause, f"({synonym_clause})", "OR")
+                term_clause.add(RawClause(f"({synonym_clause})"))
 
         return term_clause
 
-    def build_base_query(self,  # noqa: PLR0913
+    def build_base_query(self,  # noqa: PLR0913, PLR0917
                          query: dict[str, str],
                          fields: dict[BaseEnum, str],
                          boost_fields: dict[BaseEnum, int],
                          fuzzy_fields: dict[BaseEnum, dict[str, int]],
                          synonym_fields: dict[BaseEnum, str],
-                         is_child_search: bool) -> dict[str, list[str]]:
-        """Return a solr query with filters for each subsequent term."""
+                         is_child_search: bool,
+                         boost_variants=0) -> dict[str, list[str]]:
+        """Return a solr query with filters for each subsequent term (cached by the query and field profile).
+
+        The 'degraded' list gives the parts dropped to keep the query within the complexity budget. The boost
+        variants are the caller's optional ordering clauses (dropped when 'boostVariants' is in the list).
+        """
+        return self.build_base_queries(
+            [query], fields, boost_fields, fuzzy_fields, synonym_fields, is_child_search, [boost_variants])[0]
+
+    def build_base_queries(self,  # noqa: PLR0913, PLR0917
+                           queries: list[dict[str, str]],
+                           fields: dict[BaseEnum, str],
+                           boost_fields: dict[BaseEnum, int],
+                           fuzzy_fields: dict[BaseEnum, dict[str, int]],
+                           synonym_fields: dict[BaseEnum, str],
+                           is_child_search: bool,
+                           boost_variants: list[int] | None = None) -> list[dict[str, list[str]]]:
+        """Return the base queries (see build_base_query) for many queries sharing the same field profile.
+
+        The queries are built in one pass: the profile part of the cache key is computed once and the clauses
+        of a term are only built once across all of the queries.
+        """
+        profile_key = (
+            tuple(fields.items()),
+            tuple(boost_fields.items()),
+            tuple((field, tuple(sorted(fuzzy.items()))) for field, fuzzy in fuzzy_fields.items()),
+            tuple(synonym_fields.items()),
+            is_child_search,
+        )
+        term_clauses: dict[tuple, ClauseGroup] = {}
+        base_queries = []
+        for query, variants in zip(queries, boost_variants or [0] * len(queries), strict=True):
+            key = (
+                " ".join(query["value"].split()),
+                tuple(sorted((k, v) for k, v in query.items() if k != "value" and v)),
+                profile_key,
+                variants,
+            )
+            query_clause, filters, degraded = self.base_query_cache.get_or_set(
+                key,
+                partial(self._build_base_query,
+                        query, fields, boost_fields, fuzzy_fields, synonym_fields, is_child_search, variants,
+                        term_clauses))
+            # NOTE: callers add to the filter list so it is copied
+            base_queries.append({"query": query_clause, "filter": list(filters), "degraded": list(degraded)})
+        return base_queries
+
+    def clear_cache(self):
+        """Clear the cached queries and synonyms (i.e. after the synonyms change)."""
+        self.base_query_cache.clear()
+        self._synonym_tries = {}
+
+    def _build_base_query(self,  # noqa: PLR0913, PLR0917
+                          query: dict[str, str],
+                          fields: dict[BaseEnum, str],
+                          boost_fields: dict[BaseEnum, int],
+                          fuzzy_fields: dict[BaseEnum, dict[str, int]],
+                          synonym_fields: dict[BaseEnum, str],
+                          is_child_search: bool,
+                          boost_variants: int,
+                          term_clauses: dict[tuple, ClauseGroup] | None = None
+                          ) -> tuple[str, tuple[str, ...], tuple[str, ...]]:
+        """Return the solr query clause, filters and degradations for the query.
+
+        term_clauses holds the term clauses already built (shared when building many queries).
+        """
+        term_clauses = {} if term_clauses is None else term_clauses
         terms = query["value"].split()
+        fields, fuzzy_fields, degraded = self.fit_budget(
+            terms, fields, boost_fields, fuzzy_fields, synonym_fields, boost_variants)
         synonym_info = {}
-        query_clause = ""
+        query_clause = ClauseGroup("AND")
         # Each term in the searched 'value' must match on at least one of:
         # 'fields', 'fuzzy_fields' or 'synonym_fields' query clauses.
         # This loop adds clauses for the all the given fields for each term
         for term_index, term in enumerate(terms):
             # Get the base clause, which references the fields, fuzzy fields and adds the boost clause for ordering
-            term_clause = self.build_term_clause(term, fields, boost_fields, fuzzy_fields, is_child_search)
+            term_key = (term, tuple(fields), tuple(fuzzy_fields))
+            if (base_clause := term_clauses.get(term_key)) is None:
+                base_clause = self.build_term_clause(term, fields, boost_fields, fuzzy_fields, is_child_search)
+                term_clauses[term_key] = base_clause
+            # NOTE: copied so the synonym clauses are not added to the shared term clause
+            term_clause = ClauseGroup("OR", list(base_clause.clauses))
 
             # Add the synonym field clauses
             term_clause = self.build_term_synonym_clauses(term_clause, terms, term_index, synonym_info, synonym_fields, is_child_search, boost_fields)
 
             # Join the term clause to the full query
-            query_clause = self.join_clause(query_clause, f"({term_clause})", "AND")
+            query_clause.add(term_clause)
 
         # Add extra filters if applicable
         filters = self.build_filter_clause(query, is_child_search)
 
-        if not query_clause:
+        # drop duplicate / no-op clauses before serializing
+        if not (query_node := query_clause.simplify()):
             # handle empty string provided for query value
-            query_clause = '""'
+            return '""', tuple(filters), tuple(degraded)
+        if isinstance(query_node, ClauseGroup):
+            if query_node.operator == "AND" and not query_node.boost:
+                return query_node.serialize(), tuple(filters), tuple(degraded)
+            return query_node.serialize_nested(), tuple(filters), tuple(degraded)
+        return f"({query_node.serialize()})", tuple(filters), tuple(degraded)
+
+    def fit_budget(self,  # noqa: PLR0913, PLR0917
+                   terms: list[str],
+                   fields: dict[BaseEnum, str],
+                   boost_fields: dict[BaseEnum, int],
+                   fuzzy_fields: dict[BaseEnum, dict[str, int]],
+                   synonym_fields: dict[BaseEnum, str],
+                   boost_variants: int):
+        """Return the fields and fuzzy fields reduced to fit the complexity budget and what was dropped.
+
+        Every term is kept. Fuzzy fields are dropped one at a time (lowest boosted and then most expensive first),
+        then the boost variants and lastly the lowest boosted fields (at least one field is always kept). Queries
+        that still don't fit are rejected.
+        """
+        degraded = []
+        fuzzy_counts = {}
+        fuzzy_costs = {}
+        for field, fuzzy in fuzzy_fields.items():
+            if field in fields and (distances := [distance for term in terms
+                                                  if (distance := self.get_term_fuzzy_distance(term, fuzzy))]):
+                fuzzy_counts[field] = len(distances)
+                fuzzy_costs[field] = sum(distances)
+
+        def fuzzy_count() -> int:
+            """Return the number of fuzzy clauses the query will have."""
+            return sum(count for field, count in fuzzy_counts.items() if field in fields)
+
+        def clause_count() -> int:
+            """Return the max number of clauses the query will have."""
+            return len(terms) * (len(fields) + len(synonym_fields)) + fuzzy_count() + boost_variants
+
+        if fuzzy_count() > self.max_fuzzy_clauses or clause_count() > self.max_clauses:
+            by_value = sorted(fuzzy_counts, key=lambda field: (boost_fields.get(field, 0), -fuzzy_costs[field]))
+            while by_value and (fuzzy_count() > self.max_fuzzy_clauses or clause_count() > self.max_clauses):
+                del fuzzy_counts[by_value.pop(0)]
+            fuzzy_fields = {field: fuzzy for field, fuzzy in fuzzy_fields.items() if field in fuzzy_counts}
+            degraded.append("fuzzy")
+        if boost_variants and clause_count() > self.max_clauses:
+            boost_variants = 0
+            degraded.append("boostVariants")
+        if len(fields) > 1 and clause_count() > self.max_clauses:
+            # NOTE: sorted is stable so the later fields are dropped first for equal boosts
+            by_value = sorted(fields, key=lambda field: boost_fields.get(field, 0), reverse=True)
+            while len(by_value) > 1 and clause_count() > self.max_clauses:
+                fields = {field: level for field, level in fields.items() if field != by_value[-1]}
+                by_value.pop()
+            fuzzy_fields = {field: fuzzy for field, fuzzy in fuzzy_fields.items() if field in fields}
+            degraded.append("fields")
+        if (count := clause_count()) > self.max_clauses:
+            raise BusinessException(error=f"Query needs {count} clauses (max {self.max_clauses}).",
+                                    message="Search query has too many terms.",
+                                    status_code=HTTPStatus.BAD_REQUEST)
+        return fields, fuzzy_fields, degraded
 
-        return {"query": query_clause, "filter": filters}
-    
     def find_synonym_terms(self, start_term: str, start_term_index: int, terms: list[str], field: BaseEnum) -> list[str]:
         """Return the synonym terms that match the starting term and following query terms."""
+        return self.get_synonym_trie(self.synonym_field_map[field]).longest_match(terms, start_term_index)
+
+    def get_synonym_trie(self, synonym_type: BaseEnum) -> SynonymTrie:
+        """Return the synonym trie for the synonym type (loaded from the db if missing or expired)."""
         # NOTE: when this is in a common space the model will be a common dependency similar to whats been done in lear
-        from namex_solr_api.models import SolrSynonymList
-
-        # the best match will be the one with the most words (i.e. british columbia > british)
-        best_synonym_match_terms = []
-        # check if term exists inside a synonym
-        if synonyms := SolrSynonymList.find_all_beginning_with_phrase(start_term, self.synonym_field_map[field]):
-            for synonym_terms in [syn.synonym.split() for syn in synonyms]:
-                if len(synonym_terms) > len(terms[start_term_index:]) or len(synonym_terms) == 0:
-                    # not possible to be this synonym
-                    continue
-                if len(synonym_terms) < len(best_synonym_match_terms):
-                    # this is a shorter synonym than one thats already matched so skip
-                    continue
-
-                # see if all terms of the synonym are in the query
-                full_synonym_in_query = True
-                for i, synonym_term in enumerate(synonym_terms):
-                    if terms[start_term_index + i].lower() != synonym_term.lower():
-                        full_synonym_in_query = False
-                        break
-                if full_synonym_in_query:
-                    best_synonym_match_terms = synonym_terms
-
-        return best_synonym_match_terms
+        from namex_solr_api.models import SolrSynonymList  # noqa: PLC0415
+
+        trie, loaded_at = self._synonym_tries.get(synonym_type, (None, 0))
+        if not trie or monotonic() - loaded_at > self.synonym_trie_ttl:
+            trie = SynonymTrie(SolrSynonymList.get_all_synonyms(synonym_type))
+            self._synonym_tries = {**self._synonym_tries, synonym_type: (trie, monotonic())}
+        return trie
+
+    def synonym_stats(self) -> dict:
+        """Return the loaded synonym trie info."""
+        return {
+            synonym_type.value: {"phrases": trie.size, "ageSeconds": round(monotonic() - loaded_at)}
+            for synonym_type, (trie, loaded_at) in self._synonym_tries.items()
+        }
+
+    def get_term_fuzzy_distance(self, term: str, fuzzy: dict[str, int]) -> int | None:
+        """Return the fuzzy edit distance for the term adjusted by the indexed term stats.
+
+        Fuzzy matching is skipped for common terms and the distance is lowered where the dictionary is dense.
+        """
+        if (distance := self.get_fuzzy_distance(term, fuzzy["short"], fuzzy["long"])) is None:
+            return None
+        if stats := self.get_term_stats():
+            if stats.doc_freq(term) >= self.fuzzy_common_doc_freq:
+                return None
+            if distance and stats.neighbours(term) >= self.fuzzy_dense_prefix_terms:
+                distance -= 1
+        return distance
+
+    def get_term_stats(self) -> TermStats | None:
+        """Return the indexed term stats (reloaded if missing or expired, None if there is no loader).
+
+        The stats are reloaded outside of the lock by one thread while the others keep using the last stats (None
+        until the first load finishes).
+        """
+        if not self.term_stats_loader:
+            return None
+        stats, loaded_at = self._term_stats or (None, 0)
+        if stats and monotonic() - loaded_at <= self.term_stats_ttl:
+            return stats
+        with self._term_stats_lock:
+            if self._term_stats_loading:
+                return stats
+            self._term_stats_loading = True
+        try:
+            # NOTE: the previous stats are kept when the reload fails (tried again after the ttl)
+            if (doc_freqs := self.term_stats_loader()) is not None:
+                stats = TermStats(doc_freqs)
+        finally:
+            with self._term_stats_lock:
+                self._term_stats = (stats or TermStats({}), monotonic())
+                self._term_stats_loading = False
+        return self._term_stats[0]
+
+    def term_stats_info(self) -> dict:
+        """Return the loaded term stats info."""
+        if not self._term_stats:
+            return {"enabled": bool(self.term_stats_loader)}
+        stats, loaded_at = self._term_stats
+        return {"enabled": True, "terms": stats.size, "ageSeconds": round(monotonic() - loaded_at)}
 
     @staticmethod
     def build_facet(field: BaseEnum, is_nested: bool) -> dict[str, dict]:
@@ -258,17 +478,10 @@ class QueryBuilder:
         return facet
 
     @staticmethod
-    def get_fuzzy_str(term: str, short: int, long: int) -> str:
-        """Return the fuzzy string for the term."""
+    def get_fuzzy_distance(term: str, short: int, long: int) -> int | None:
+        """Return the fuzzy edit distance for the term (None if the term is too short for fuzzy matching)."""
         if len(term) < 4:  # noqa: PLR2004
-            return ""
+            return None
         if len(term) < 7:  # noqa: PLR2004
-            return f"~{short}"
-        return f"~{long}"
-
-    @staticmethod
-    def join_clause(current_clause: str, new_clause: str, join_str: str):
-        """Return the current clause added with the new clause."""
-        if current_clause:
-            current_clause += f" {join_str} "
-        return current_clause + new_clause
+            return short
+        return long
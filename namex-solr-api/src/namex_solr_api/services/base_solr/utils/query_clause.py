@@ -0,0 +1,142 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Lightweight solr query clause tree (simplified before it is serialized into the query string)."""
+from dataclasses import dataclass, field, replace
+
+
+@dataclass(frozen=True)
+class FieldClause:
+    """Class definition of a field:value clause."""
+
+    field: str  # includes any block join prefix
+    value: str
+    boost: int | None = None
+    fuzzy: int | None = None
+
+    @property
+    def key(self) -> tuple:
+        """Return what identifies the clause (the boost is not part of it)."""
+        return (self.field, self.value, self.fuzzy)
+
+    def serialize(self) -> str:
+        """Return the clause as a query string."""
+        clause = f"{self.field}:{self.value}"
+        if self.fuzzy is not None:
+            clause += f"~{self.fuzzy}"
+        if self.boost:
+            clause += f"^{self.boost}"
+        return clause
+
+
+@dataclass(frozen=True)
+class RawClause:
+    """Class definition of a prebuilt clause (i.e. identifier or synonym clauses)."""
+
+    value: str
+    boost: int | None = None
+
+    @property
+    def key(self) -> tuple:
+        """Return what identifies the clause (the boost is not part of it)."""
+        return (self.value,)
+
+    def serialize(self) -> str:
+        """Return the clause as a query string."""
+        return f"({self.value})^{self.boost}" if self.boost else self.value
+
+
+@dataclass
+class ClauseGroup:
+    """Class definition of clauses joined by an operator."""
+
+    operator: str
+    clauses: list["FieldClause | RawClause | ClauseGroup"] = field(default_factory=list)
+    boost: int | None = None
+
+    @property
+    def key(self) -> tuple:
+        """Return what identifies the group (the boost is not part of it, the boosts of its clauses are)."""
+        return (self.operator, tuple((clause.key, clause.boost) for clause in self.clauses))
+
+    def add(self, clause: "FieldClause | RawClause | ClauseGroup"):
+        """Add the clause to the group."""
+        self.clauses.append(clause)
+
+    def simplify(self) -> "FieldClause | RawClause | ClauseGroup | None":
+        """Return the simplified clause tree.
+
+        Nested groups with the same operator are flattened and groups with one clause are collapsed (into the clause). Identical
+        clauses in a group (i.e. the clauses of a repeated term) are merged into one by summing their boosts,
+        which is the same rewrite lucene does on the parsed query so the matches and scores are unchanged.
+        NOTE: fuzzy clauses (including ~0) are never merged into exact ones since solr scores them differently.
+        """
+        clauses: list[FieldClause | RawClause | ClauseGroup] = []
+        clause_indexes: dict[tuple, int] = {}
+        for clause in self._flatten():
+            key = (type(clause), clause.key)
+            if (index := clause_indexes.get(key)) is not None:
+                boost = (clauses[index].boost or 1) + (clause.boost or 1)
+                clauses[index] = replace(clauses[index], boost=boost)
+                continue
+            clause_indexes[key] = len(clauses)
+            clauses.append(clause)
+        if not clauses:
+            return None
+        if len(clauses) == 1:
+            if not self.boost:
+                return clauses[0]
+            # NOTE: nested boosts multiply
+            return replace(clauses[0], boost=(clauses[0].boost or 1) * self.boost)
+        return ClauseGroup(self.operator, clauses, self.boost)
+
+    def serialize(self) -> str:
+        """Return the group as a query string (nested groups are wrapped in brackets)."""
+        return f" {self.operator} ".join(
+            clause.serialize_nested() if isinstance(clause, ClauseGroup) else clause.serialize()
+            for clause in self.clauses)
+
+    def serialize_nested(self) -> str:
+        """Return the group as a query string wrapped in brackets (with its boost)."""
+        nested = f"({self.serialize()})"
+        return f"{nested}^{self.boost}" if self.boost else nested
+
+    def _flatten(self):
+        """Yield the simplified clauses with nested (unboosted) groups of the same operator flattened."""
+        for clause in self.clauses:
+            simplified = clause.simplify() if isinstance(clause, ClauseGroup) else clause
+            if (isinstance(simplified, ClauseGroup) and simplified.operator == self.operator
+                    and not simplified.boost):
+                yield from simplified.clauses
+            elif simplified:
+                yield simplified
@@ -32,7 +32,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """Solr query params."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from namex_solr_api.common.base_enum import BaseEnum
 
@@ -54,3 +54,8 @@ class QueryParams:  # pylint: disable=too-few-public-methods
     query_fuzzy_fields: dict[BaseEnum, dict[str, int]]
     query_synonym_fields: dict[BaseEnum, str]
     full_query_boosts: list[dict[str, BaseEnum | str]]
+    # server side search profile (solr paramset) and the values it references
+    profile: str | None = None
+    profile_values: dict[str, str] | None = None
+    # parts of the query dropped to fit the query complexity budget (set when the payload is built)
+    degraded: list[str] = field(default_factory=list)
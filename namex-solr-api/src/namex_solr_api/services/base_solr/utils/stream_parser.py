@@ -0,0 +1,189 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Incremental parser for iterating the docs of a solr json response as it is received."""
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_NO_DOC = object()
+
+
+class SolrDocStream:
+    """Iterates the docs of a solr json response without loading the whole body.
+
+    The objects on the path to the docs list (i.e. 'response') are walked key by key and every other value is
+    decoded whole into `meta` (i.e. responseHeader, numFound, highlighting). Values before the docs list (like
+    numFound) are available as soon as the stream is opened and values after it once the docs are exhausted.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], docs_path: tuple[str, ...] = ("response", "docs"), on_close=None):
+        """Initialize the stream and parse up to the first doc."""
+        self.meta: dict = {}
+        self.docs_path = docs_path
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+        self._on_close = on_close
+        self._closed = False
+        self._docs = self._iter_docs()
+        # NOTE: parses everything before the docs so the header values / errors are available up front
+        self._first = next(self._docs, _NO_DOC)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Return the docs iterator."""
+        if self._first is not _NO_DOC:
+            first, self._first = self._first, _NO_DOC
+            yield first
+        yield from self._docs
+
+    def __enter__(self):
+        """Return the stream."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the stream."""
+        self.close()
+
+    def close(self):
+        """Release the underlying response."""
+        if not self._closed:
+            self._closed = True
+            if self._on_close:
+                self._on_close()
+
+    def _read(self) -> bool:
+        """Add the next chunk to the buffer (returns False if there was nothing left)."""
+        if self._exhausted:
+            return False
+        # drop the consumed part of the buffer
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if text := self._decoder.decode(chunk):
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._exhausted = True
+        return False
+
+    def _at_end(self) -> bool:
+        """Return True if there is nothing but whitespace left."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return False
+            if not self._read():
+                return True
+
+    def _peek(self) -> str:
+        """Return the next non whitespace char (without consuming it)."""
+        if self._at_end():
+            raise ValueError("Unexpected end of solr response.")
+        return self._buffer[self._pos]
+
+    def _expect(self, chars: str) -> str:
+        """Consume and return the next non whitespace char if it is one of the given chars."""
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"Unexpected '{char}' in solr response at {self._pos}.")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode and return the next complete json value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # NOTE: read until the pending data doubles so large values are not re-parsed per chunk
+                pending = len(self._buffer) - self._pos
+                while len(self._buffer) - self._pos < 2 * pending:
+                    if not self._read():
+                        break
+                if len(self._buffer) - self._pos == pending:
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._exhausted and not isinstance(value, (dict, list, str)):
+                self._read()
+                continue
+            self._pos = end
+            return value
+
+    def _iter_docs(self) -> Iterator[dict]:
+        """Walk the response to the docs list and yield each doc."""
+        try:
+            yield from self._walk_object(self.meta, self.docs_path)
+            if not self._at_end():
+                raise ValueError("Unexpected data after solr response.")
+        finally:
+            self.close()
+
+    def _walk_object(self, meta: dict, path: tuple[str, ...]) -> Iterator[dict]:
+        """Decode the object into meta while descending into the given path."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if path and key == path[0]:
+                if len(path) == 1:
+                    yield from self._walk_list()
+                else:
+                    meta[key] = {}
+                    yield from self._walk_object(meta[key], path[1:])
+            else:
+                meta[key] = self._value()
+            if self._expect(",}") == "}":
+                return
+
+    def _walk_list(self) -> Iterator[dict]:
+        """Yield each value of the list."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
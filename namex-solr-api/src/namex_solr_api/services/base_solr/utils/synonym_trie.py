@@ -0,0 +1,66 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Token trie used to find the longest synonym phrase matching the query terms."""
+from collections.abc import Iterable
+
+_PHRASE = object()  # key of the matched phrase terms in a trie node
+
+
+class SynonymTrie:
+    """Trie of synonym phrases keyed by their (lowercased) terms."""
+
+    def __init__(self, phrases: Iterable[str]):
+        """Initialize the trie with the given phrases."""
+        self.size = 0
+        self._root: dict = {}
+        for phrase in phrases:
+            if not (terms := phrase.split()):
+                continue
+            node = self._root
+            for term in terms:
+                node = node.setdefault(term.lower(), {})
+            if _PHRASE not in node:
+                self.size += 1
+            node[_PHRASE] = terms
+
+    def longest_match(self, terms: list[str], start_index: int) -> list[str]:
+        """Return the terms of the longest phrase matching the query terms from the start index (case insensitive)."""
+        node = self._root
+        best_match = []
+        for term in terms[start_index:]:
+            if (node := node.get(term.lower())) is None:
+                break
+            if phrase := node.get(_PHRASE):
+                best_match = phrase
+        return list(best_match)
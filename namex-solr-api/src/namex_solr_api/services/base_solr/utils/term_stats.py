@@ -0,0 +1,62 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Indexed term statistics used to decide on fuzzy matching."""
+from collections import Counter
+
+
+class TermStats:
+    """Document frequencies of the most common indexed terms (from the solr terms component).
+
+    The number of loaded terms sharing a prefix is used as a measure of how dense the dictionary is around a
+    term (the denser it is the more terms a fuzzy clause expands to).
+    """
+
+    def __init__(self, doc_freqs: dict[str, int], prefix_length: int = 3):
+        """Initialize the stats."""
+        self.doc_freqs = doc_freqs
+        self.prefix_length = prefix_length
+        self._prefix_counts = Counter(term[:prefix_length] for term in doc_freqs)
+
+    @property
+    def size(self) -> int:
+        """Return the number of terms loaded."""
+        return len(self.doc_freqs)
+
+    def doc_freq(self, term: str) -> int:
+        """Return the number of docs with the term (0 if it is not one of the loaded terms)."""
+        return self.doc_freqs.get(term, 0)
+
+    def neighbours(self, term: str) -> int:
+        """Return the number of loaded terms sharing the term's prefix."""
+        return self._prefix_counts.get(term[:self.prefix_length], 0)
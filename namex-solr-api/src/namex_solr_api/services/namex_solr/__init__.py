@@ -32,13 +32,15 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """This module wraps the solr classes/fields for using namex solr."""
-from dataclasses import asdict
+from collections.abc import Iterator
 
-from flask import Flask
+from flask import Flask, current_app
 
+from namex_solr_api.common.ttl_cache import TTLCache
+from namex_solr_api.exceptions import SolrException
 from namex_solr_api.models import SolrSynonymList
 from namex_solr_api.services.base_solr import Solr
-from namex_solr_api.services.base_solr.utils import QueryBuilder, prep_query_str
+from namex_solr_api.services.base_solr.utils import QueryBuilder, json_codec, prep_query_str_variants
 
 from .doc_models.name import Name, NameField
 from .doc_models.possible_conflict import PCField, PossibleConflict
@@ -53,6 +55,9 @@ class NamexSolr(Solr):
             identifier_field_values=[],
             unique_parent_field=PCField.TYPE,
             synonym_field_map={NameField.NAME_Q_SYN: SolrSynonymList.Type.ALL})
+        self.search_profiles_enabled = False
+        self.max_rows = 10000
+        self.term_stats_limit = 20000
 
         # fields
         self.resp_fields = [
@@ -81,6 +86,44 @@ class NamexSolr(Solr):
             NameField.PARENT_TYPE.value,
             NameField.UNIQUE_KEY.value,
         ]
+        self.export_fields = [
+            PCField.UNIQUE_KEY.value,
+            PCField.CORP_NUM.value,
+            PCField.JURISDICTION.value,
+            PCField.NR_NUM.value,
+            PCField.START_DATE.value,
+            PCField.STATE.value,
+            PCField.TYPE.value,
+            PCField.NAMES.value,
+            "[child limit=-1]",
+            NameField.CHOICE.value,
+            NameField.NAME.value,
+            NameField.NAME_STATE.value,
+            NameField.SUBMIT_COUNT.value
+        ]
+
+    def init_app(self, app: Flask):
+        """Initialize the Solr environment."""
+        super().init_app(app)
+        self.query_builder.base_query_cache = TTLCache(maxsize=app.config.get("SOLR_QUERY_CACHE_SIZE", 1000),
+                                                       ttl=app.config.get("SOLR_QUERY_CACHE_TTL", 300))
+        self.query_builder.synonym_trie_ttl = app.config.get("SOLR_SYNONYM_TRIE_TTL", 300)
+        self.search_profiles_enabled = app.config.get("SOLR_SEARCH_PROFILES_ENABLED", False)
+        self.max_rows = app.config.get("SOLR_SVC_NAMEX_MAX_ROWS", 10000)
+        self.query_builder.max_clauses = app.config.get("SOLR_QUERY_MAX_CLAUSES", 300)
+        self.query_builder.max_fuzzy_clauses = app.config.get("SOLR_QUERY_MAX_FUZZY_CLAUSES", 40)
+        if app.config.get("SOLR_TERM_STATS_ENABLED", True):
+            self.term_stats_limit = app.config.get("SOLR_TERM_STATS_LIMIT", 20000)
+            self.query_builder.term_stats_loader = self.get_name_term_doc_freqs
+            self.query_builder.term_stats_ttl = app.config.get("SOLR_TERM_STATS_TTL", 3600)
+            self.query_builder.fuzzy_common_doc_freq = app.config.get("SOLR_FUZZY_COMMON_DOC_FREQ", 10000)
+            self.query_builder.fuzzy_dense_prefix_terms = app.config.get("SOLR_FUZZY_DENSE_PREFIX_TERMS", 50)
+
+    def create_or_update_synonyms(self, synonym_type: SolrSynonymList.Type, synonyms: dict[str: list[str]]):
+        """Create or update the synonyms in the core and clear the queries built with the old synonyms."""
+        resp = super().create_or_update_synonyms(synonym_type, synonyms)
+        self.query_builder.clear_cache()
+        return resp
 
     def create_or_replace_docs(self,
                                docs: list[PossibleConflict] | None = None,
@@ -88,70 +131,136 @@ class NamexSolr(Solr):
                                timeout=25,
                                additive=True):
         """Create or replace solr docs in the core."""
-        update_list = raw_docs if raw_docs else [asdict(doc) for doc in docs]
+        url, update_list = self.get_update_payload(docs, raw_docs, additive)
+        stream_docs = url == self.bulk_update_url and self.bulk_update_format == "commands"
+        return self.call_solr("POST", url, json_data=update_list, timeout=timeout, stream_docs=stream_docs)
+
+    def get_update_payload(self,
+                           docs: list[PossibleConflict] | None = None,
+                           raw_docs: list[dict] | None = None,
+                           additive=True) -> tuple[str, list[dict | PossibleConflict]]:
+        """Return the update url and payload for creating or replacing the docs.
+
+        NOTE: docs are left as dataclasses (the solr json codec serializes them directly).
+        """
+        update_list = raw_docs if raw_docs else docs
 
         if not additive and not raw_docs:
-            for pc_dict in update_list:
-                # names
-                if names := pc_dict.get(PCField.NAMES.value, None):
-                    pc_dict[PCField.NAMES.value] = {"set": names}
+            # names (shallow copy so the given docs are not changed)
+            update_list = [{**vars(doc), PCField.NAMES.value: {"set": doc.names}} if doc.names else doc
+                           for doc in docs]
 
         url = self.update_url if len(update_list) < 1000 else self.bulk_update_url  # noqa: PLR2004
-        return self.call_solr("POST", url, json_data=update_list, timeout=timeout)
+        return url, update_list
+
+    def export_possible_conflicts(self, conflict_type: str | None = None, rows: int = 1000) -> Iterator[dict]:
+        """Yield every possible conflict (with all of its names) in the core."""
+        payload = {
+            "query": f"{PCField.TYPE.value}:{conflict_type or '*'}",
+            "fields": self.export_fields
+        }
+        return self.iter_cursor(payload, PCField.UNIQUE_KEY.value, rows)
+
+    def get_name_term_doc_freqs(self) -> dict[str, int] | None:
+        """Return the doc frequencies of the most common name terms (None if solr could not be reached)."""
+        params = {
+            "terms.fl": NameField.NAME_Q_XTRA.value,
+            "terms.limit": self.term_stats_limit,
+            "terms.sort": "count",
+            "json.nl": "map",
+            "wt": "json",
+        }
+        try:
+            response = self.call_solr("GET", self.terms_url, params=params, leader=False, timeout=10)
+            return json_codec.loads(response.content).get("terms", {}).get(NameField.NAME_Q_XTRA.value, {})
+        except SolrException as err:
+            current_app.logger.warning(f"Unable to load the name term stats: {err.error}")
+            return None
 
     @staticmethod
     def get_name_search_full_query_boost(query_value: str):
-        """Return the list of full query boost information intended for business search."""
+        """Return the list of full query boost information intended for business search.
+
+        Boosts for the same field, value and fuzziness (i.e. dash variants equal to the default) are merged into
+        one clause with the summed boost, which gives the same score as sending each clause. The dash variants
+        are flagged so they can be dropped for queries over the complexity budget.
+        """
+        # add more boost clauses if a dash is in the query
+        dashes = [None, "remove", "pad", "tighten", "tighten-remove"] if "-" in query_value else [None]
+        values = prep_query_str_variants(query_value, dashes)
         full_query_boosts = [
             {
                 "field": NameField.NAME_Q_EXACT,
-                "value": prep_query_str(query_value),
+                "value": values[None],
                 "boost": "3",
             },
             {
                 "field": NameField.NAME_Q_SINGLE,
-                "value": prep_query_str(query_value),
+                "value": values[None],
                 "boost": "2",
             },
             {
                 "field": NameField.NAME_Q,
-                "value": prep_query_str(query_value),
+                "value": values[None],
                 "boost": "5",
                 "fuzzy": "5"
             },
             {
                 "field": NameField.NAME_Q_AGRO,
-                "value": prep_query_str(query_value),
+                "value": values[None],
                 "boost": "3",
                 "fuzzy": "10"
             }
         ]
-        # add more boost clauses if a dash is in the query
         if "-" in query_value:
             full_query_boosts += [
                 {
                     "field": NameField.NAME_Q,
-                    "value": prep_query_str(query_value, "remove"),
+                    "value": values["remove"],
                     "boost": "3",
-                    "fuzzy": "5"
+                    "fuzzy": "5",
+                    "variant": True
                 },
                 {
                     "field": NameField.NAME_Q,
-                    "value": prep_query_str(query_value, "pad"),
+                    "value": values["pad"],
                     "boost": "7",
-                    "fuzzy": "5"
+                    "fuzzy": "5",
+                    "variant": True
                 },
                 {
                     "field": NameField.NAME_Q,
-                    "value": prep_query_str(query_value, "tighten"),
+                    "value": values["tighten"],
                     "boost": "7",
-                    "fuzzy": "5"
+                    "fuzzy": "5",
+                    "variant": True
                 },
                 {
                     "field": NameField.NAME_Q,
-                    "value": prep_query_str(query_value, "tighten-remove"),
+                    "value": values["tighten-remove"],
                     "boost": "3",
-                    "fuzzy": "5"
+                    "fuzzy": "5",
+                    "variant": True
                 }
             ]
-        return full_query_boosts
+        return NamexSolr.merge_full_query_boosts(full_query_boosts)
+
+    @staticmethod
+    def get_name_search_profile_values(query_value: str) -> dict[str, str]:
+        """Return the values referenced by the full query boosts of the possible_conflict_names search profile."""
+        if "-" not in query_value:
+            return {"qv": prep_query_str_variants(query_value, [None])[None]}
+        values = prep_query_str_variants(query_value, [None, "remove", "pad", "tighten", "tighten-remove"])
+        return {f"qv_{dash.replace('-', '_')}" if dash else "qv": value for dash, value in values.items()}
+
+    @staticmethod
+    def merge_full_query_boosts(full_query_boosts: list[dict]) -> list[dict]:
+        """Return the full query boosts with duplicate clauses merged (boosts are summed)."""
+        merged: dict[tuple, dict] = {}
+        for info in full_query_boosts:
+            key = (info["field"], info["value"], info.get("fuzzy"))
+            if existing := merged.get(key):
+                existing["boost"] = str(int(existing["boost"]) + int(info["boost"]))
+            else:
+                merged[key] = {**info}
+        return list(merged.values())
@@ -0,0 +1,63 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""This module wraps the namex solr class for use from asyncio code."""
+from namex_solr_api.models import SolrSynonymList
+from namex_solr_api.services.base_solr.async_solr import AsyncSolr
+
+from . import NamexSolr
+from .doc_models.possible_conflict import PossibleConflict
+
+
+class AsyncNamexSolr(AsyncSolr):
+    """Asyncio counterpart of the NamexSolr class."""
+
+    def __init__(self, solr: NamexSolr):
+        """Initialize the async namex solr class."""
+        super().__init__(solr)
+        self.solr: NamexSolr = solr
+
+    async def create_or_replace_docs(self,
+                                     docs: list[PossibleConflict] | None = None,
+                                     raw_docs: list[dict] | None = None,
+                                     timeout=25,
+                                     additive=True):
+        """Create or replace solr docs in the core."""
+        url, update_list = self.solr.get_update_payload(docs, raw_docs, additive)
+        return await self.call_solr("POST", url, json_data=update_list, timeout=timeout)
+
+    async def create_or_update_synonyms(self, synonym_type: SolrSynonymList.Type, synonyms: dict[str: list[str]]):
+        """Create or update the synonyms in the core and clear the queries built with the old synonyms."""
+        resp = await super().create_or_update_synonyms(synonym_type, synonyms)
+        self.solr.query_builder.clear_cache()
+        return resp
@@ -33,5 +33,11 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """This module manages util methods for the NameX solr service."""
 from .formatting_helpers import prep_query_str_namex
-from .namex_search_helper import namex_search
+from .namex_search_helper import (
+    namex_search,
+    namex_search_bulk,
+    namex_search_classify_highlights,
+    namex_search_payloads,
+    namex_search_stream,
+)
 from .synonym_helpers import get_synonyms
@@ -33,12 +33,20 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Solr formatting functions."""
 import re
+from functools import lru_cache
 
 from flask import current_app
 
 from namex_solr_api.services.base_solr.utils.formatting_helpers import prep_query_str
 
 
+@lru_cache(maxsize=8)
+def _get_designation_rgx(designations: tuple[str, ...]) -> re.Pattern:
+    """Return the compiled regex matching a designation at the end of the query."""
+    # NOTE: designations are not escaped (i.e. the '.' in 'inc.' matches any character)
+    return re.compile(fr'({"|".join(designations)})$')
+
+
 def prep_query_str_namex(query: str, dash: str | None = None, replace_and = True, remove_designations = True) -> str:
     r"""Return the query string prepped for solr call.
 
@@ -57,7 +65,6 @@ def prep_query_str_namex(query: str, dash: str | None = None, replace_and = True
         return ""
 
     if remove_designations and (designations := current_app.config.get("DESIGNATIONS")):
-        designation_rgx = fr'({"|".join(designations)})$'
-        query = re.sub(designation_rgx, r"", query.lower())
+        query = _get_designation_rgx(tuple(designations)).sub(r"", query.lower())
 
     return prep_query_str(query, dash, replace_and)
@@ -32,33 +32,154 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """NameX solr search functions."""
+import asyncio
 import re
 
 from namex_solr_api.services.base_solr.utils import QueryParams
+from namex_solr_api.services.base_solr.utils.stream_parser import SolrDocStream
 from namex_solr_api.services.namex_solr import NamexSolr
+from namex_solr_api.services.namex_solr.async_namex_solr import AsyncNamexSolr
 from namex_solr_api.services.namex_solr.doc_models import NameField, PCField
 
 from .add_category_filters import add_category_filters
+from .search_profiles import SEARCH_PROFILES, SearchProfile
+
+_HIGHLIGHTED_RGX = re.compile(r"\|\|\|([^\|]*)\|\|\|")
 
 
 def namex_search(params: QueryParams, solr: NamexSolr, is_name_search: bool):
     """Return the list of possible conflicts from Solr that match the query."""
-    # initialize payload with base doc query (init query / filter)
-    initial_queries = solr.query_builder.build_base_query(
-        query=params.query,
-        fields=params.query_fields,
-        boost_fields=params.query_boost_fields,
-        fuzzy_fields=params.query_fuzzy_fields,
-        synonym_fields=params.query_synonym_fields,
-        is_child_search=is_name_search)
+    solr_payload = namex_search_payload(params, solr, is_name_search)
+    profile = get_search_profile(params, solr)
+    resp: dict[str, dict[str, dict[str, list[str]]]] = solr.query(
+        solr_payload, params.start, params.rows, use_params=profile.name if profile else None)
+    return namex_search_parse_response(resp, params)
+
+
+def namex_search_bulk(params_list: list[QueryParams],
+                      solr: NamexSolr,
+                      is_name_search: bool,
+                      max_concurrency: int = 10,
+                      deadline: float = 30) -> list[dict | Exception]:
+    """Return the results of many searches sharing a field profile (queried concurrently).
+
+    Each result is the same as namex_search or the error raised for that search. Searches not finished before
+    the deadline (seconds for the whole batch) are cancelled and given a TimeoutError.
+    """
+    payloads = namex_search_payloads(params_list, solr, is_name_search)
+    # NOTE: a separate async solr so its http client is only used by this batch's event loop
+    async_solr = AsyncNamexSolr(solr)
+
+    async def search(params: QueryParams, payload: dict, limit: asyncio.Semaphore) -> dict:
+        """Return the parsed results of the search."""
+        async with limit:
+            profile = get_search_profile(params, solr)
+            resp = await async_solr.query(payload, params.start, params.rows,
+                                          use_params=profile.name if profile else None)
+            return namex_search_parse_response(resp, params)
+
+    async def search_all() -> list[dict | Exception]:
+        """Run the searches until they finish or the deadline passes."""
+        limit = asyncio.Semaphore(max_concurrency)
+        tasks = [asyncio.create_task(search(params, payload, limit))
+                 for params, payload in zip(params_list, payloads, strict=True)]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            await async_solr.close()
+        return [TimeoutError("Search deadline exceeded.") if task.cancelled() else task.exception() or task.result()
+                for task in tasks]
+
+    return asyncio.run(search_all())
+
+
+def namex_search_parse_response(resp: dict, params: QueryParams) -> dict:
+    """Return the solr response with the highlighting parsed into lists of highlighted terms."""
+    if solr_highlighting := resp.get('highlighting'):
+        parsed_highlighting = {}
+        for result_id, result in solr_highlighting.items():
+            parsed_highlighting[result_id] = {}
+            for field_enum in params.highlighted_fields:
+                if field_highlights := result.get(field_enum.value):
+                    parsed_highlighting[result_id][field_enum.value] = [
+                        term for highlight in field_highlights for term in namex_search_parse_highlighting(highlight)
+                    ]
+        resp['highlighting'] = parsed_highlighting
+    return resp
+
+
+def namex_search_stream(params: QueryParams, solr: NamexSolr, is_name_search: bool) -> SolrDocStream:
+    """Return a stream of the possible conflicts from Solr that match the query.
+
+    NOTE: highlighting is returned after the docs by solr so it is not supported when streaming.
+    """
+    solr_payload = namex_search_payload(params, solr, is_name_search)
+    profile = get_search_profile(params, solr)
+    return solr.query_stream(solr_payload, params.start, params.rows, use_params=profile.name if profile else None)
+
+
+def get_search_profile(params: QueryParams, solr: NamexSolr) -> SearchProfile | None:
+    """Return the server side search profile for the query (None if not enabled)."""
+    if not solr.search_profiles_enabled or not params.profile:
+        return None
+    return SEARCH_PROFILES.get(params.profile)
+
+
+def namex_search_payload(params: QueryParams, solr: NamexSolr, is_name_search: bool) -> dict:
+    """Return the solr payload for the query.
+
+    With a search profile the fields, highlighting and full query boosts are given by the solr paramset.
+    Parts of the query dropped to fit the complexity budget are added to params.degraded.
+    """
+    return namex_search_payloads([params], solr, is_name_search)[0]
+
+
+def namex_search_payloads(params_list: list[QueryParams], solr: NamexSolr, is_name_search: bool) -> list[dict]:
+    """Return the solr payloads for many queries sharing the field profile of the first params.
+
+    The base queries are built in one pass (see QueryBuilder.build_base_queries) instead of once per query.
+    """
+    shared = params_list[0]
+    # initialize payloads with base doc query (init query / filter)
+    base_queries = solr.query_builder.build_base_queries(
+        queries=[params.query for params in params_list],
+        fields=shared.query_fields,
+        boost_fields=shared.query_boost_fields,
+        fuzzy_fields=shared.query_fuzzy_fields,
+        synonym_fields=shared.query_synonym_fields,
+        is_child_search=is_name_search,
+        boost_variants=[sum(1 for info in params.full_query_boosts if info.get("variant")) for params in params_list])
+    return [_namex_search_payload(params, solr, is_name_search, initial_queries)
+            for params, initial_queries in zip(params_list, base_queries, strict=True)]
+
+
+def _namex_search_payload(params: QueryParams, solr: NamexSolr, is_name_search: bool, initial_queries: dict) -> dict:
+    """Return the solr payload for the query with the given base query."""
+    profile = get_search_profile(params, solr)
+    if params.rows and params.rows > solr.max_rows:
+        params.rows = solr.max_rows
+        params.degraded.append("rows")
+    degraded = initial_queries.pop("degraded")
+    params.degraded += degraded
 
     # boosts for term order result ordering
-    for info in params.full_query_boosts:
-        initial_queries["query"] += f' OR ({info["field"].value}:"{info["value"]}"'
-        if fuzzy := info.get("fuzzy"):
-            initial_queries["query"] += f'~{fuzzy}^{info["boost"]})'
-        else:
-            initial_queries["query"] += f'^{info["boost"]})'
+    full_query_boosts = params.full_query_boosts
+    profile_values = params.profile_values or {}
+    if "boostVariants" in degraded:
+        full_query_boosts = [info for info in full_query_boosts if not info.get("variant")]
+        profile_values = {key: value for key, value in profile_values.items() if key == "qv"}
+    if profile:
+        initial_queries["query"] += profile.boost_query(profile_values)
+    else:
+        for info in full_query_boosts:
+            initial_queries["query"] += f' OR ({info["field"].value}:"{info["value"]}"'
+            if fuzzy := info.get("fuzzy"):
+                initial_queries["query"] += f'~{fuzzy}^{info["boost"]})'
+            else:
+                initial_queries["query"] += f'^{info["boost"]})'
 
     # add defaults
     parent_field = NameField.PARENT_TYPE.value if is_name_search else PCField.TYPE.value
@@ -68,9 +189,13 @@ def namex_search(params: QueryParams, solr: NamexSolr, is_name_search: bool):
             "parents": f"{parent_field}:*",
             "parentFilters": " AND ".join(initial_queries["filter"]),
         },
-        "fields": params.fields
     }
-    if params.highlighted_fields:
+    if profile:
+        # fields and highlighting are set by the profile
+        solr_payload["params"] = profile_values
+    else:
+        solr_payload["fields"] = params.fields
+    if params.highlighted_fields and not profile:
         solr_payload = {
             **solr_payload,
             **namex_search_highlighting(params)
@@ -90,19 +215,7 @@ def namex_search(params: QueryParams, solr: NamexSolr, is_name_search: bool):
                          is_child=True,
                          is_child_search=is_name_search,
                          solr=solr)
-
-    resp: dict[str, dict[str, dict[str, list[str]]]] = solr.query(solr_payload, params.start, params.rows)
-    if solr_highlighting := resp.get('highlighting'):
-        parsed_highlighting = {}
-        for result_id, result in solr_highlighting.items():
-            parsed_highlighting[result_id] = {}
-            for field_enum in params.highlighted_fields:
-                if field_highlights := result.get(field_enum.value):
-                    parsed_highlighting[result_id][field_enum.value] = []
-                    for highlight in field_highlights:
-                        parsed_highlighting[result_id][field_enum.value] += namex_search_parse_highlighting(highlight)
-        resp['highlighting'] = parsed_highlighting
-    return resp
+    return solr_payload
 
 
 def namex_search_highlighting(params: QueryParams):
@@ -120,5 +233,26 @@ def namex_search_highlighting(params: QueryParams):
 
 def namex_search_parse_highlighting(highlighted_value: str) -> list[str]:
     """Return the parsed list of highlighted terms."""
-    highlighted_rgx = r'\|\|\|([^\|]*)\|\|\|'
-    return re.findall(highlighted_rgx, highlighted_value)
+    return _HIGHLIGHTED_RGX.findall(highlighted_value)
+
+
+def namex_search_classify_highlights(query_terms: frozenset[str], highlighting: dict[str, list[str]]) -> dict:
+    """Return the exact, stem and synonym terms highlighted for a doc.
+
+    query_terms are the upper case query terms (built once per search). Exact terms are the query terms found in
+    the single field highlights, stems / synonyms are the other terms highlighted in those fields.
+    """
+    def split_highlights(highlights: list[str]) -> set[str]:
+        """Return the set of upper case single terms in the highlights."""
+        return {term for highlight in highlights for term in highlight.upper().split()}
+
+    exact = set()
+    if exact_full_terms := split_highlights(highlighting.get(NameField.NAME_Q_SINGLE.value, [])):
+        exact = set(query_terms & exact_full_terms)
+        if remaining := query_terms - exact:
+            # NOTE: a query term also counts when it is part of a highlighted term (the field is ngrammed)
+            joined = "\n".join(exact_full_terms)
+            exact.update(term for term in remaining if term in joined)
+    stems = split_highlights(highlighting.get(NameField.NAME_Q_STEM_HIGHLIGHT.value, [])) - exact
+    synonyms = {x.upper() for x in highlighting.get(NameField.NAME_Q_SYN.value, [])} - exact - stems
+    return {"exact": list(exact), "stems": list(stems), "synonyms": list(synonyms)}
@@ -0,0 +1,61 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Search profiles registered in solr as paramsets (namex-solr conf/params.json)."""
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class SearchProfile:
+    """Class definition of a search profile.
+
+    The fields, highlighting and full query boost clauses live in the solr paramset of the same name so a
+    search only sends the normalized terms / filters plus the profile values (i.e. qv) the boosts reference.
+    """
+
+    name: str
+    # paramset params holding full query boost clauses -> the profile value they require
+    boost_params: dict[str, str] = field(default_factory=dict)
+
+    def boost_query(self, values: dict[str, str]) -> str:
+        """Return the query clauses for the profile's full query boosts that have their values given."""
+        return "".join(f' OR _query_:"{{!lucene v=${param}}}"'
+                       for param, value_key in self.boost_params.items() if value_key in values)
+
+
+SEARCH_PROFILES = {
+    profile.name: profile for profile in [
+        SearchProfile("possible_conflict_names", boost_params={"name_boost": "qv", "name_dash_boost": "qv_remove"}),
+        SearchProfile("nrs"),
+    ]
+}
@@ -0,0 +1,171 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Write-behind queue for the search history (keeps the db insert off of the search response path)."""
+import atexit
+import queue
+import random
+import threading
+from datetime import UTC, datetime
+
+from flask import Flask
+from sqlalchemy import insert
+
+from namex_solr_api.models import SearchHistory, db
+
+
+class SearchHistoryWriter:
+    """Queues search history rows and inserts them in batches from a background thread.
+
+    When the queue is full the row is dropped (policy 'drop') or written by the caller (policy 'sync').
+    """
+
+    app: Flask = None
+
+    def __init__(self, app: Flask = None):
+        """Initialize the writer."""
+        self.enabled = True
+        self.sample_rate = 1.0
+        self.flush_interval = 2.0
+        self.batch_size = 100
+        self.full_policy = "drop"
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=1000)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._shutdown_registered = False
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "sampledOut": 0, "failed": 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        """Initialize app dependent variables."""
+        self.app = app
+        self.enabled = app.config.get("SEARCH_HISTORY_ASYNC", True)
+        self.sample_rate = app.config.get("SEARCH_HISTORY_SAMPLE_RATE", 1.0)
+        self.flush_interval = app.config.get("SEARCH_HISTORY_FLUSH_INTERVAL", 2.0)
+        self.batch_size = app.config.get("SEARCH_HISTORY_BATCH_SIZE", 100)
+        self.full_policy = app.config.get("SEARCH_HISTORY_FULL_POLICY", "drop")
+        self._queue = queue.Queue(maxsize=app.config.get("SEARCH_HISTORY_QUEUE_SIZE", 1000))
+        if not self._shutdown_registered:
+            # NOTE: registered once (the flusher thread is restarted in each forked worker)
+            atexit.register(self._shutdown)
+            self._shutdown_registered = True
+
+    def record(self, query: dict, results: list[dict], submitter_id: int):
+        """Record the search (sampled, and queued unless async writes are disabled)."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            self._count("sampledOut")
+            return
+        row = {
+            "query": query,
+            "results": results,
+            "submitter_id": submitter_id,
+            "search_date": datetime.now(UTC),
+        }
+        if not self.enabled:
+            self._insert([row])
+            return
+        self._start()
+        try:
+            self._queue.put_nowait(row)
+            self._count("queued")
+        except queue.Full:
+            if self.full_policy == "sync":
+                self._insert([row])
+            else:
+                self._count("dropped")
+                self.app.logger.warning("Search history queue is full. Dropping the search.")
+
+    def flush(self):
+        """Insert everything in the queue."""
+        while rows := self._get_batch(timeout=0):
+            self._write(rows)
+
+    def stats(self) -> dict:
+        """Return the writer stats."""
+        return {**self._stats, "pending": self._queue.qsize(), "enabled": self.enabled}
+
+    def _start(self):
+        """Start the background flusher if it is not running (i.e. in each forked worker)."""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="search-history-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Insert the queued rows in batches until stopped."""
+        while not self._stop.is_set():
+            if rows := self._get_batch(timeout=self.flush_interval):
+                self._write(rows)
+
+    def _shutdown(self):
+        """Stop the background flusher and write the remaining rows."""
+        self._stop.set()
+        self.flush()
+
+    def _get_batch(self, timeout: float) -> list[dict]:
+        """Return the next batch of rows (waits up to the timeout for the first row)."""
+        rows = []
+        try:
+            rows.append(self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait())
+            while len(rows) < self.batch_size:
+                rows.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return rows
+
+    def _write(self, rows: list[dict]):
+        """Insert the rows from outside of a request."""
+        with self.app.app_context():
+            self._insert(rows)
+
+    def _insert(self, rows: list[dict]):
+        """Insert the rows (one multi row insert)."""
+        try:
+            db.session.execute(insert(SearchHistory), rows)
+            db.session.commit()
+            self._count("written", len(rows))
+        except Exception as err:
+            db.session.rollback()
+            self._count("failed", len(rows))
+            self.app.logger.error(f"Failed to save {len(rows)} search history rows: {err!r}")
+
+    def _count(self, stat: str, amount: int = 1):
+        """Increment the stat."""
+        with self._lock:
+            self._stats[stat] += amount
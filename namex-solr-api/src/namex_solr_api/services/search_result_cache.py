@@ -0,0 +1,160 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Search result cache invalidated by the replicated index version of the solr followers."""
+import hashlib
+import json
+import threading
+from time import monotonic
+
+from flask import Flask, current_app
+from flask_caching import Cache
+
+from namex_solr_api.exceptions import SolrException
+from namex_solr_api.services.base_solr import Solr
+from namex_solr_api.services.base_solr.utils import QueryParams
+
+
+class SearchResultCache:
+    """Caches search results keyed by the canonical search params and the followers' index version.
+
+    The followers only change when they replicate a new index, so results are reused until the version changes
+    (the version is checked at most once per version interval). Searches are not cached when the version is unknown.
+    """
+
+    def __init__(self, solr: Solr, app: Flask = None):
+        """Initialize the cache."""
+        self.solr = solr
+        self.cache = Cache()
+        self.enabled = False
+        self.timeout = 3600
+        self.max_rows = 1000
+        self.version_interval = 10.0
+        self._version: tuple[str | None, float] | None = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        """Initialize app dependent variables."""
+        self.enabled = app.config.get("SEARCH_RESULT_CACHE_ENABLED", False)
+        self.timeout = app.config.get("SEARCH_RESULT_CACHE_TIMEOUT", 3600)
+        self.max_rows = app.config.get("SEARCH_RESULT_CACHE_MAX_ROWS", 1000)
+        self.version_interval = app.config.get("SEARCH_RESULT_CACHE_VERSION_INTERVAL", 10)
+        # NOTE: separate from the auth cache so search results don't push out tokens / auth responses
+        self.cache.init_app(app, config={
+            "CACHE_DIR": app.config.get("SEARCH_RESULT_CACHE_DIR", "search_cache"),
+            "CACHE_THRESHOLD": app.config.get("SEARCH_RESULT_CACHE_THRESHOLD", 5000),
+        })
+
+    def get_index_version(self) -> str | None:
+        """Return the followers' index version (rechecked after the version interval, None if unavailable).
+
+        The version is fetched outside of the lock by one thread while the others keep using the last version.
+        """
+        version, checked_at = self._version or (None, 0)
+        if self._version and monotonic() - checked_at <= self.version_interval:
+            return version
+        with self._lock:
+            if self._refreshing:
+                return version
+            self._refreshing = True
+        try:
+            version = self.solr.get_index_version()
+        except SolrException as err:
+            current_app.logger.debug(f"Unable to get the solr index version: {err.with_traceback(None)}")
+            version = None
+        finally:
+            with self._lock:
+                self._version = (version, monotonic())
+                self._refreshing = False
+        return version
+
+    def get_key(self, name: str, params: QueryParams) -> str | None:
+        """Return the cache key for the search (None if the search can not be cached)."""
+        rows = params.rows or self.solr.default_rows
+        if not self.enabled or rows > self.max_rows or not (version := self.get_index_version()):
+            self._count("bypassed")
+            return None
+
+        def canonical(categories: dict) -> dict:
+            """Return the categories keyed by field name with the filter values sorted."""
+            return {getattr(field, "value", field): sorted(set(values)) if isinstance(values, list) else values
+                    for field, values in categories.items() if values}
+
+        search = {
+            "query": params.query,
+            "childQuery": params.child_query,
+            "categories": canonical(params.categories),
+            "childCategories": canonical(params.child_categories),
+            "start": params.start or self.solr.default_start,
+            "rows": rows,
+            "profile": params.profile,
+            # derived from the raw value (i.e. dashes / designations removed by the prepped query)
+            "fullQueryBoosts": params.full_query_boosts,
+            "profileValues": params.profile_values,
+        }
+        digest = hashlib.sha256(json.dumps(search, sort_keys=True, default=str).encode()).hexdigest()
+        return f"search/{name}/{version}/{digest}"
+
+    def get(self, key: str | None) -> dict | None:
+        """Return the cached search results."""
+        if not key:
+            return None
+        if (results := self.cache.get(key)) is None:
+            self._count("misses")
+        else:
+            self._count("hits")
+        return results
+
+    def set(self, key: str | None, results: dict):
+        """Cache the search results."""
+        if key:
+            self.cache.set(key, results, timeout=self.timeout)
+
+    def _count(self, stat: str):
+        """Increment the stat."""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> dict:
+        """Return the cache stats."""
+        version, checked_at = self._version or (None, None)
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "indexVersion": version,
+            "versionAgeSeconds": round(monotonic() - checked_at) if checked_at is not None else None
+        }
@@ -0,0 +1,126 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Benchmark the solr bulk update body formats (docs/sec).
+
+Usage:
+    python tests/benchmarks/bulk_update_formats.py --url http://localhost:8983/solr --core name_request
+
+NOTE: indexes synthetic docs (ids prefixed with BENCH-) into the given core and deletes them afterwards.
+"""
+import argparse
+import time
+import zlib
+
+import requests
+
+from namex_solr_api.services.base_solr.utils import json_codec
+from namex_solr_api.services.namex_solr.doc_models import Name, PossibleConflict
+
+FORMATS = ["json", "commands"]
+
+
+def build_docs(count: int) -> list[PossibleConflict]:
+    """Return synthetic possible conflict docs with 3 names each."""
+    return [
+        PossibleConflict(
+            id=f"BENCH-{index}",
+            names=[Name(name=f"BENCHMARK {index} HOLDINGS NUMBER {choice} LTD.", name_state="A", choice=choice)
+                   for choice in range(1, 4)],
+            state="APPROVED",
+            type="NR",
+            nr_num=f"BENCH-{index}",
+            jurisdiction="BC")
+        for index in range(count)
+    ]
+
+
+def encode(docs: list[PossibleConflict], body_format: str, gzip_level: int | None):
+    """Return the request body for the docs.
+
+    NOTE: uncompressed command streams are encoded while being sent (so their encode time is part of the total).
+    """
+    chunks = json_codec.iter_add_commands(docs) if body_format == "commands" else [json_codec.dumps(docs)]
+    if gzip_level is None:
+        return b"".join(chunks) if body_format == "json" else chunks
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return b"".join([compressor.compress(chunk) for chunk in chunks] + [compressor.flush()])
+
+
+def run(url: str, core: str, docs: list[PossibleConflict], batch: int, body_format: str, gzip_level: int | None):
+    """Index the docs in batches and return the (encode seconds, total seconds)."""
+    session = requests.Session()
+    headers = {"Content-Type": "application/json"}
+    if gzip_level is not None:
+        headers["Content-Encoding"] = "gzip"
+    encode_time = 0.0
+    start = time.perf_counter()
+    for offset in range(0, len(docs), batch):
+        encode_start = time.perf_counter()
+        body = encode(docs[offset:offset + batch], body_format, gzip_level)
+        encode_time += time.perf_counter() - encode_start
+        resp = session.post(f"{url}/{core}/update?overwrite=true&wt=json", data=body, headers=headers, timeout=300)
+        resp.raise_for_status()
+    session.get(f"{url}/{core}/update?commit=true&wt=json", timeout=300).raise_for_status()
+    return encode_time, time.perf_counter() - start
+
+
+def cleanup(url: str, core: str):
+    """Delete the benchmark docs."""
+    requests.post(f"{url}/{core}/update?commit=true&wt=json",
+                  data="<delete><query>id:BENCH-*</query></delete>",
+                  headers={"Content-Type": "application/xml"},
+                  timeout=300).raise_for_status()
+
+
+def main():
+    """Run the benchmark for each format."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8983/solr")
+    parser.add_argument("--core", default="name_request")
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--gzip", type=int, default=None, help="gzip level (requests are not compressed if unset)")
+    args = parser.parse_args()
+
+    docs = build_docs(args.docs)
+    for body_format in FORMATS:
+        cleanup(args.url, args.core)
+        encode_time, total_time = run(args.url, args.core, docs, args.batch, body_format, args.gzip)
+        print(f"{body_format:>10}: {args.docs / total_time:,.0f} docs/sec "  # noqa: T201
+              f"(encode {encode_time:.2f}s, total {total_time:.2f}s)")
+    cleanup(args.url, args.core)
+
+
+if __name__ == "__main__":
+    main()
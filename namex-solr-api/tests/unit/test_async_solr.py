@@ -0,0 +1,109 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the async solr client retries and raises errors as expected."""
+import asyncio
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from namex_solr_api.exceptions import SolrException
+from namex_solr_api.services import solr
+from namex_solr_api.services.base_solr.async_solr import AsyncSolr
+
+
+def call_solr(responses: list, method: str, **kwargs) -> tuple[httpx.Response | SolrException, list[httpx.Request]]:
+    """Return the result of the async call (and the requests sent) for a transport giving the responses in order."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        """Return (or raise) the next response."""
+        requests.append(request)
+        response = responses[len(requests) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def run():
+        """Call solr with the mocked transport."""
+        async_solr = AsyncSolr(solr)
+        async_solr._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await async_solr.call_solr(method, solr.synonyms_url + "/test", **kwargs)
+        except SolrException as err:
+            return err
+        finally:
+            await async_solr.close()
+
+    return asyncio.run(run()), requests
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers(app):
+    """Reset the circuit breakers so failed calls in one test don't open them for the next."""
+    solr.breakers = {}
+
+
+def test_call_solr(app):
+    """Assert the json response is returned."""
+    resp, requests = call_solr([httpx.Response(HTTPStatus.OK, json={"responseHeader": {}})], "GET")
+    assert resp.json() == {"responseHeader": {}}
+    assert len(requests) == 1
+
+
+@pytest.mark.parametrize("method,error,expected_calls", [
+    ("GET", httpx.ConnectError("refused"), 2),
+    ("PUT", httpx.ConnectError("refused"), 2),
+    ("GET", httpx.ReadError("reset"), 2),
+    ("PUT", httpx.ReadError("reset"), 1),
+    ("PUT", httpx.ReadTimeout("timed out"), 1),
+])
+def test_call_solr_transport_error(app, method: str, error: Exception, expected_calls: int):
+    """Assert only requests that were never sent or are safe to resend are retried after a transport error."""
+    resp, requests = call_solr([error, httpx.Response(HTTPStatus.OK, json={})], method, json_data={"a": ["b"]})
+    if expected_calls == 1:
+        assert isinstance(resp, SolrException)
+        assert resp.error == f"Connection error while handling Solr request., {HTTPStatus.GATEWAY_TIMEOUT}"
+    else:
+        assert resp.status_code == HTTPStatus.OK
+    assert len(requests) == expected_calls
+
+
+def test_call_solr_error(app):
+    """Assert a solr error response is raised with its message and status (without retrying)."""
+    resp, requests = call_solr(
+        [httpx.Response(HTTPStatus.BAD_REQUEST, json={"error": {"msg": "bad query"}})], "GET")
+    assert isinstance(resp, SolrException)
+    assert resp.error == f"bad query, {HTTPStatus.BAD_REQUEST}"
+    assert len(requests) == 1
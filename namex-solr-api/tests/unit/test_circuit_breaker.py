@@ -0,0 +1,104 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the circuit breaker changes state as expected."""
+import pytest
+
+from namex_solr_api.services.base_solr.utils import circuit_breaker
+from namex_solr_api.services.base_solr.utils.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Return a controllable clock used by the breaker."""
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker, "monotonic", lambda: now[0])
+    return now
+
+
+def test_circuit_breaker_opens(clock):
+    """Assert the breaker opens at the failure threshold and rejects requests while open."""
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.State.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.State.OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.to_dict() == {"state": "open", "consecutiveFailures": 3, "trips": 1, "rejected": 1}
+
+
+@pytest.mark.parametrize("probe_succeeds,expected_state", [
+    (True, CircuitBreaker.State.CLOSED),
+    (False, CircuitBreaker.State.OPEN),
+])
+def test_circuit_breaker_half_open(clock, probe_succeeds: bool, expected_state: CircuitBreaker.State):
+    """Assert the breaker lets probes through after the open period and closes / reopens on the result."""
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, half_open_probes=1)
+    breaker.record_failure()
+    clock[0] += 9
+    assert not breaker.allow_request()
+
+    clock[0] += 1
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.State.HALF_OPEN
+    # only one probe is let through at a time
+    assert not breaker.allow_request()
+
+    if probe_succeeds:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    assert breaker.state == expected_state
+    assert breaker.allow_request() == probe_succeeds
+    assert breaker.trips == 1 + (not probe_succeeds)
+
+
+def test_circuit_breaker_unresolved_probe(clock):
+    """Assert a probe that never resolves does not keep the breaker half open forever."""
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10)
+    breaker.record_failure()
+    clock[0] += 10
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    clock[0] += 10
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.State.HALF_OPEN
@@ -0,0 +1,113 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure hedged solr calls work as expected."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from namex_solr_api.services.base_solr.utils.hedging import HedgeStats, hedged_call
+
+
+@pytest.fixture
+def executor():
+    """Return a hedge executor."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def make_call(results: dict, calls: list, delays: dict | None = None):
+    """Return a call giving (or raising) the node result after the node delay."""
+    def call(node: str):
+        """Return the node result."""
+        calls.append((node, threading.current_thread()))
+        time.sleep((delays or {}).get(node, 0))
+        if isinstance(results[node], Exception):
+            raise results[node]
+        return results[node]
+    return call
+
+
+def test_hedged_call_fast_primary(executor: ThreadPoolExecutor):
+    """Assert a fast primary is called inline and no hedge is sent."""
+    calls = []
+    stats = HedgeStats()
+    result = hedged_call(executor, make_call({"a": "A", "b": "B"}, calls), "a", lambda _: "b", 0.5, stats)
+    assert result == "A"
+    assert calls == [("a", threading.current_thread())]
+    assert stats.to_dict() == {"requests": 1, "hedges": 0, "hedgeWins": 0, "primaryWins": 0}
+
+
+def test_hedged_call_slow_primary(executor: ThreadPoolExecutor):
+    """Assert a hedge is sent when the primary is slower than the delay."""
+    calls = []
+    stats = HedgeStats()
+    result = hedged_call(executor, make_call({"a": "A", "b": "B"}, calls, {"a": 0.2}), "a", lambda _: "b", 0.01, stats)
+    assert result == "A"
+    assert sorted(node for node, _ in calls) == ["a", "b"]
+    assert stats.to_dict() == {"requests": 1, "hedges": 1, "hedgeWins": 0, "primaryWins": 1}
+
+
+def test_hedged_call_failed_primary(executor: ThreadPoolExecutor):
+    """Assert the hedge result is used when the primary fails."""
+    calls = []
+    stats = HedgeStats()
+    result = hedged_call(executor, make_call({"a": ValueError("a"), "b": "B"}, calls), "a", lambda _: "b", 0.5, stats)
+    assert result == "B"
+    assert stats.to_dict() == {"requests": 1, "hedges": 1, "hedgeWins": 1, "primaryWins": 0}
+
+
+def test_hedged_call_all_failed(executor: ThreadPoolExecutor):
+    """Assert the primary error is raised when the hedge fails too (or there is no node to hedge to)."""
+    results = {"a": ValueError("a"), "b": KeyError("b")}
+    with pytest.raises(ValueError, match="a"):
+        hedged_call(executor, make_call(results, []), "a", lambda _: "b", 0.5, HedgeStats())
+    with pytest.raises(ValueError, match="a"):
+        hedged_call(executor, make_call(results, []), "a", lambda _: None, 0.5, HedgeStats())
+
+
+def test_hedged_call_busy_executor(executor: ThreadPoolExecutor):
+    """Assert searches are not queued behind a busy executor."""
+    release = threading.Event()
+    for _ in range(2):
+        executor.submit(release.wait, 5)
+    calls = []
+    start = time.monotonic()
+    result = hedged_call(executor, make_call({"a": "A", "b": "B"}, calls), "a", lambda _: "b", 0.01, HedgeStats())
+    assert result == "A"
+    assert time.monotonic() - start < 1
+    assert calls == [("a", threading.current_thread())]
+    release.set()
@@ -0,0 +1,67 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure gzip import payloads are decoded as expected."""
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+
+from namex_solr_api.exceptions import BusinessException
+from namex_solr_api.resources.internal.solr.imports import _get_request_json
+
+PAYLOAD = {"possibleConflicts": [{"id": "NR 1"}], "timeout": 60}
+
+
+@pytest.mark.parametrize("data,headers", [
+    (json.dumps(PAYLOAD).encode(), {"Content-Type": "application/json"}),
+    (gzip.compress(json.dumps(PAYLOAD).encode()), {"Content-Type": "application/json", "Content-Encoding": "gzip"}),
+])
+def test_get_request_json(app, data: bytes, headers: dict):
+    """Assert plain and gzip encoded payloads are decoded."""
+    with app.test_request_context(method="PUT", data=data, headers=headers):
+        assert _get_request_json() == PAYLOAD
+
+
+@pytest.mark.parametrize("data,max_size,expected_status", [
+    (gzip.compress(json.dumps(PAYLOAD).encode()), 10, HTTPStatus.REQUEST_ENTITY_TOO_LARGE),
+    (b"not gzip", 1000, HTTPStatus.BAD_REQUEST),
+])
+def test_get_request_json_invalid(app, monkeypatch, data: bytes, max_size: int, expected_status: HTTPStatus):
+    """Assert gzip payloads over the decompressed size cap or that can't be decompressed are rejected."""
+    monkeypatch.setitem(app.config, "MAX_IMPORT_DECOMPRESSED_SIZE", max_size)
+    headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    with app.test_request_context(method="PUT", data=data, headers=headers), pytest.raises(BusinessException) as err:
+        _get_request_json()
+    assert err.value.status_code == expected_status
@@ -0,0 +1,67 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the namex search helpers work as expected."""
+import pytest
+
+from namex_solr_api.services.namex_solr.doc_models import NameField
+from namex_solr_api.services.namex_solr.utils import namex_search_classify_highlights
+from namex_solr_api.services.namex_solr.utils.namex_search_helper import namex_search_parse_highlighting
+
+
+def test_parse_highlighting():
+    """Assert the highlighted terms are parsed out of the solr highlight."""
+    assert namex_search_parse_highlighting("|||CAN||| BANANA |||ORCHARD||| LTD") == ["CAN", "ORCHARD"]
+    assert namex_search_parse_highlighting("CAN BANANA") == []
+
+
+@pytest.mark.parametrize("query,highlighting,expected", [
+    ("CAN ORCHARD",
+     {NameField.NAME_Q_SINGLE.value: ["canada orchard"]},
+     {"exact": ["CAN", "ORCHARD"], "stems": [], "synonyms": []}),
+    ("A-1 ORCHARD",
+     {NameField.NAME_Q_SINGLE.value: ["A-1 ORCHARD,"]},
+     {"exact": ["A-1", "ORCHARD"], "stems": [], "synonyms": []}),
+    ("BANANA ORCHARDS",
+     {
+         NameField.NAME_Q_SINGLE.value: ["BANANA"],
+         NameField.NAME_Q_STEM_HIGHLIGHT.value: ["BANANA ORCHARD"],
+         NameField.NAME_Q_SYN.value: ["orchard", "grove"]
+     },
+     {"exact": ["BANANA"], "stems": ["ORCHARD"], "synonyms": ["GROVE"]}),
+    ("BANANA", {}, {"exact": [], "stems": [], "synonyms": []}),
+])
+def test_classify_highlights(query: str, highlighting: dict, expected: dict):
+    """Assert the highlighted terms are classified by the query terms they contain."""
+    classified = namex_search_classify_highlights(frozenset(query.split()), highlighting)
+    assert {key: sorted(value) for key, value in classified.items()} == expected
@@ -0,0 +1,288 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the solr queries are built as expected."""
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from namex_solr_api.exceptions import BusinessException
+from namex_solr_api.services.base_solr.utils import QueryBuilder
+from namex_solr_api.services.base_solr.utils.query_clause import ClauseGroup, FieldClause, RawClause
+from namex_solr_api.services.namex_solr.doc_models import NameField, PCField
+
+FIELDS = {NameField.NAME_Q: "child", NameField.NAME_Q_AGRO: "child", NameField.NAME_Q_SINGLE: "child"}
+BOOST_FIELDS = {NameField.NAME_Q_AGRO: 3, NameField.NAME_Q_SINGLE: 2}
+FUZZY_FIELDS = {
+    NameField.NAME_Q: {"short": 1, "long": 2},
+    NameField.NAME_Q_AGRO: {"short": 1, "long": 2},
+    NameField.NAME_Q_SINGLE: {"short": 1, "long": 2}
+}
+
+
+@pytest.fixture
+def query_builder():
+    """Return a query builder without term stats or synonyms."""
+    return QueryBuilder(identifier_field_values=[], unique_parent_field=PCField.TYPE, synonym_field_map={})
+
+
+@pytest.mark.parametrize("value,fields,boost_fields,fuzzy_fields,is_child_search,expected", [
+    ("SHOPPING", {NameField.NAME_Q: "parent"}, {}, {}, False, "(name_q:SHOPPING)"),
+    ("", {NameField.NAME_Q: "parent"}, {}, {}, False, '""'),
+    ("BANANA",
+     {NameField.NAME_Q: "parent", NameField.NAME_Q_SINGLE: "parent"},
+     {},
+     {NameField.NAME_Q: {"short": 1, "long": 2}},
+     True,
+     '({!child of="type:*"}name_q:BANANA OR {!child of="type:*"}name_q:BANANA~1 OR '
+     '{!child of="type:*"}name_q_single_term:BANANA)'),
+    ("SHOP SHOP",
+     {NameField.NAME_Q: "parent", NameField.NAME_Q_SINGLE: "parent"},
+     {NameField.NAME_Q_SINGLE: 2},
+     {NameField.NAME_Q_SINGLE: {"short": 0, "long": 2}},
+     False,
+     "(name_q:SHOP OR name_q_single_term:SHOP^2 OR name_q_single_term:SHOP~0)^2"),
+    ("SHOP ORCHARD SHOP",
+     {NameField.NAME_Q: "parent", NameField.NAME_Q_SINGLE: "parent"},
+     {},
+     {},
+     False,
+     "(name_q:SHOP OR name_q_single_term:SHOP)^2 AND (name_q:ORCHARD OR name_q_single_term:ORCHARD)"),
+])
+def test_build_base_query(query_builder: QueryBuilder,  # noqa: PLR0913
+                          value: str,
+                          fields: dict,
+                          boost_fields: dict,
+                          fuzzy_fields: dict,
+                          is_child_search: bool,
+                          expected: str):
+    """Assert the base query string is built as expected."""
+    base_query = query_builder.build_base_query(
+        {"value": value}, fields, boost_fields, fuzzy_fields, {}, is_child_search)
+    assert base_query["query"] == expected
+    assert base_query["degraded"] == []
+
+
+@pytest.mark.parametrize("group,expected", [
+    (ClauseGroup("OR", [FieldClause("f", "A", 2), FieldClause("f", "A")]), "f:A^3"),
+    (ClauseGroup("OR", [FieldClause("f", "A", 2), FieldClause("f", "A", None, 0)]), "f:A^2 OR f:A~0"),
+    (ClauseGroup("OR", [FieldClause("f", "A", None, 1), FieldClause("f", "A", 2, 1)]), "f:A~1^3"),
+    (ClauseGroup("OR", [FieldClause("f", "A"), ClauseGroup("OR", [FieldClause("g", "B")])]), "f:A OR g:B"),
+    (ClauseGroup("OR", [FieldClause("h", "B"),
+                        ClauseGroup("AND", [ClauseGroup("OR", [FieldClause("f", "A"), FieldClause("g", "A")]),
+                                            ClauseGroup("OR", [FieldClause("f", "A"), FieldClause("g", "A")])])]),
+     "h:B OR (f:A OR g:A)^2"),
+    (ClauseGroup("AND", [ClauseGroup("OR", [FieldClause("f", "A"), FieldClause("g", "A", 2)]),
+                         ClauseGroup("OR", [FieldClause("f", "A"), FieldClause("g", "A")])]),
+     "(f:A OR g:A^2) AND (f:A OR g:A)"),
+    (ClauseGroup("AND", [FieldClause("f", "A"), FieldClause("f", "A", 2), FieldClause("g", "B")]), "f:A^3 AND g:B"),
+    (ClauseGroup("OR", [RawClause("(x:1 AND y:2)"), RawClause("(x:1 AND y:2)")]), "((x:1 AND y:2))^2"),
+    (ClauseGroup("OR", [FieldClause("f", "A"), ClauseGroup("OR", [FieldClause("g", "B")], 2)]), "f:A OR g:B^2"),
+    (ClauseGroup("OR", [FieldClause("f", "A"), ClauseGroup("OR", [FieldClause("g", "B"), FieldClause("h", "B")], 2)]),
+     "f:A OR (g:B OR h:B)^2"),
+    (ClauseGroup("AND", [ClauseGroup("OR", [FieldClause("f", "A")])]), "f:A"),
+])
+def test_clause_group_simplify(group: ClauseGroup, expected: str):
+    """Assert simplifying the clause tree merges duplicate clauses without changing the score."""
+    assert group.simplify().serialize() == expected
+
+
+def test_clause_group_simplify_empty():
+    """Assert an empty clause tree simplifies to nothing."""
+    assert ClauseGroup("AND", [ClauseGroup("OR")]).simplify() is None
+
+
+def test_fit_budget_within_budget(query_builder: QueryBuilder):
+    """Assert queries within the budget are not changed."""
+    fields, fuzzy_fields, degraded = query_builder.fit_budget(
+        ["BANANA", "ORCHARD"], FIELDS, BOOST_FIELDS, FUZZY_FIELDS, {}, 2)
+    assert fields == FIELDS
+    assert fuzzy_fields == FUZZY_FIELDS
+    assert degraded == []
+
+
+def test_fit_budget_keeps_terms(query_builder: QueryBuilder):
+    """Assert every term is kept when the query is over the budget."""
+    query_builder.max_clauses = 30
+    terms = [f"TERM{index}" for index in range(25)]
+    fields, fuzzy_fields, degraded = query_builder.fit_budget(terms, FIELDS, BOOST_FIELDS, FUZZY_FIELDS, {}, 0)
+    assert len(terms) == 25  # noqa: PLR2004
+    assert list(fields) == [NameField.NAME_Q_AGRO]
+    assert fuzzy_fields == {}
+    assert degraded == ["fuzzy", "fields"]
+
+
+@pytest.mark.parametrize("max_fuzzy_clauses,expected_fuzzy_fields", [
+    (4, [NameField.NAME_Q_AGRO, NameField.NAME_Q_SINGLE]),
+    (2, [NameField.NAME_Q_AGRO]),
+    (1, []),
+])
+def test_fit_budget_drops_fuzzy_progressively(query_builder: QueryBuilder,
+                                              max_fuzzy_clauses: int,
+                                              expected_fuzzy_fields: list):
+    """Assert fuzzy fields are dropped one at a time, lowest boosted first."""
+    query_builder.max_fuzzy_clauses = max_fuzzy_clauses
+    fields, fuzzy_fields, degraded = query_builder.fit_budget(
+        ["BANANA", "ORCHARD"], FIELDS, BOOST_FIELDS, FUZZY_FIELDS, {}, 0)
+    assert fields == FIELDS
+    assert sorted(fuzzy_fields, key=list(FUZZY_FIELDS).index) == expected_fuzzy_fields
+    assert degraded == ["fuzzy"]
+
+
+def test_fit_budget_drops_expensive_fuzzy_first(query_builder: QueryBuilder):
+    """Assert the most expensive fuzzy field is dropped first for equal boosts."""
+    query_builder.max_fuzzy_clauses = 2
+    fuzzy_fields = {NameField.NAME_Q: {"short": 1, "long": 1}, NameField.NAME_Q_XTRA: {"short": 2, "long": 2}}
+    fields = {NameField.NAME_Q: "child", NameField.NAME_Q_XTRA: "child"}
+    _, fuzzy_fields, _ = query_builder.fit_budget(["BANANA", "ORCHARD"], fields, {}, fuzzy_fields, {}, 0)
+    assert list(fuzzy_fields) == [NameField.NAME_Q]
+
+
+def test_fit_budget_drops_boost_variants_before_fields(query_builder: QueryBuilder):
+    """Assert boost variants are dropped before any fields."""
+    query_builder.max_clauses = 7
+    fields, fuzzy_fields, degraded = query_builder.fit_budget(
+        ["BANANA", "ORCHARD"], FIELDS, BOOST_FIELDS, FUZZY_FIELDS, {}, 3)
+    assert fields == FIELDS
+    assert fuzzy_fields == {}
+    assert degraded == ["fuzzy", "boostVariants"]
+
+
+def test_fit_budget_rejects_queries_over_budget(query_builder: QueryBuilder):
+    """Assert queries that don't fit after degrading are rejected."""
+    query_builder.max_clauses = 10
+    terms = [f"TERM{index}" for index in range(11)]
+    with pytest.raises(BusinessException) as err:
+        query_builder.fit_budget(terms, FIELDS, BOOST_FIELDS, FUZZY_FIELDS, {}, 0)
+    assert err.value.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize("values,is_child,is_child_search,expected", [
+    (["CONDITION", "ACTIVE", "ACTIVE"], False, False, '{!terms f=state separator="\x1f"}ACTIVE\x1fCONDITION'),
+    (["A,B", "C\\D"], False, False, '{!terms f=state separator="\x1f"}A,B\x1fC\\D'),
+    (["ACTIVE"], False, True, '{!child of="type:*"}{!terms f=state separator="\x1f"}ACTIVE'),
+])
+def test_build_facet_query(query_builder: QueryBuilder,
+                           values: list[str],
+                           is_child: bool,
+                           is_child_search: bool,
+                           expected: str):
+    """Assert category filters are built as canonical terms queries with the values sent as is."""
+    assert query_builder.build_facet_query(PCField.STATE, values, is_child, is_child_search) == expected
+
+
+def test_build_facet_query_separator_value(query_builder: QueryBuilder):
+    """Assert category values containing the terms separator are rejected."""
+    with pytest.raises(BusinessException) as err:
+        query_builder.build_facet_query(PCField.STATE, ["A\x1fB"], False, False)
+    assert err.value.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.fixture
+def term_stats_builder(query_builder: QueryBuilder):
+    """Return a query builder with term stats for a common term and a dense prefix."""
+    doc_freqs = {"LIMITED": 50000, "ORCHARD": 20, **{f"BAN{index}": 1 for index in range(50)}}
+    query_builder.term_stats_loader = lambda: doc_freqs
+    query_builder.fuzzy_common_doc_freq = 10000
+    query_builder.fuzzy_dense_prefix_terms = 50
+    return query_builder
+
+
+@pytest.mark.parametrize("term,fuzzy,expected", [
+    ("LIMITED", {"short": 1, "long": 2}, None),
+    ("ORCHARD", {"short": 1, "long": 2}, 2),
+    ("BANANAS", {"short": 1, "long": 2}, 1),
+    ("BANANA", {"short": 1, "long": 2}, 0),
+    ("BANANA", {"short": 0, "long": 2}, 0),
+    ("BAN", {"short": 1, "long": 2}, None),
+    ("APPLES", {"short": 1, "long": 2}, 1),
+])
+def test_get_term_fuzzy_distance(term_stats_builder: QueryBuilder, term: str, fuzzy: dict, expected: int | None):
+    """Assert fuzzy matching is skipped for common terms and tightened for terms with a dense prefix."""
+    assert term_stats_builder.get_term_fuzzy_distance(term, fuzzy) == expected
+
+
+def test_get_term_fuzzy_distance_no_stats(query_builder: QueryBuilder):
+    """Assert the configured distances are used as is without term stats."""
+    assert query_builder.get_term_fuzzy_distance("LIMITED", {"short": 1, "long": 2}) == 2  # noqa: PLR2004
+    query_builder.term_stats_loader = lambda: None
+    assert query_builder.get_term_fuzzy_distance("LIMITED", {"short": 1, "long": 2}) == 2  # noqa: PLR2004
+
+
+def test_build_base_query_term_stats(term_stats_builder: QueryBuilder):
+    """Assert the fuzzy clauses of common terms are skipped in the built query."""
+    query = term_stats_builder.build_base_query(
+        {"value": "ORCHARD LIMITED"}, {NameField.NAME_Q: "parent"}, {}, {NameField.NAME_Q: {"short": 1, "long": 2}},
+        {}, False)["query"]
+    assert "name_q:ORCHARD~2" in query
+    assert "name_q:LIMITED~" not in query
+
+
+def test_get_term_stats_reload(term_stats_builder: QueryBuilder, mocker):
+    """Assert the term stats are only reloaded after the ttl and kept when a reload fails."""
+    loader = mocker.Mock(side_effect=[{"ORCHARD": 20}, None])
+    term_stats_builder.term_stats_loader = loader
+    assert term_stats_builder.get_term_stats().doc_freq("ORCHARD") == 20  # noqa: PLR2004
+    assert term_stats_builder.get_term_stats().doc_freq("ORCHARD") == 20  # noqa: PLR2004
+    assert loader.call_count == 1
+    term_stats_builder.term_stats_ttl = -1
+    assert term_stats_builder.get_term_stats().doc_freq("ORCHARD") == 20  # noqa: PLR2004
+    assert loader.call_count == 2  # noqa: PLR2004
+
+
+def test_get_term_stats_not_blocked(term_stats_builder: QueryBuilder):
+    """Assert other queries use the last stats instead of waiting on (or repeating) a reload in progress."""
+    term_stats_builder.get_term_stats()
+    term_stats_builder.term_stats_ttl = -1
+    loading = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        """Block until released."""
+        calls.append(1)
+        loading.set()
+        release.wait(5)
+        return {"ORCHARD": 30}
+
+    term_stats_builder.term_stats_loader = slow_loader
+    thread = threading.Thread(target=term_stats_builder.get_term_stats)
+    thread.start()
+    assert loading.wait(5)
+    assert term_stats_builder.get_term_stats().doc_freq("ORCHARD") == 20  # noqa: PLR2004
+    release.set()
+    thread.join(5)
+    assert len(calls) == 1
+    term_stats_builder.term_stats_ttl = 3600
+    assert term_stats_builder.get_term_stats().doc_freq("ORCHARD") == 30  # noqa: PLR2004
@@ -0,0 +1,156 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the search endpoints handle requests as expected."""
+import json
+from collections.abc import Iterable
+
+import pytest
+
+from namex_solr_api.resources.v1.search import (
+    get_bulk_query_keys,
+    get_categories_errors,
+    get_paging_errors,
+    stream_search_results,
+)
+from namex_solr_api.services import search_result_cache
+from namex_solr_api.services.base_solr.utils.stream_parser import SolrDocStream
+
+SOLR_RESPONSE = json.dumps({
+    "responseHeader": {"status": 0},
+    "response": {"numFound": 3, "docs": [{"id": "NR 1"}, {"id": "NR 2"}, {"id": "NR 3"}]}
+}).encode()
+
+
+@pytest.mark.parametrize("queries,expected_keys", [
+    ([{"value": "BANANA"}], ["BANANA"]),
+    ([{"value": "BANANA", "key": "1"}, {"value": "BANANA", "key": "2"}], ["1", "2"]),
+    ([{"value": "BANANA", "key": "1", "categories": {"state": ["ACTIVE"], "jurisdiction": None}}], ["1"]),
+])
+def test_get_bulk_query_keys(queries: list, expected_keys: list[str]):
+    """Assert each bulk query is keyed by its key or value."""
+    keys, errors = get_bulk_query_keys(queries, 2)
+    assert keys == expected_keys
+    assert errors == []
+
+
+@pytest.mark.parametrize("queries,expected_errors", [
+    (None, [{"path": "queries", "error": "Expected a list of 1 to 2 queries."}]),
+    ([], [{"path": "queries", "error": "Expected a list of 1 to 2 queries."}]),
+    ({"value": "BANANA"}, [{"path": "queries", "error": "Expected a list of 1 to 2 queries."}]),
+    ([{"value": "A"}, {"value": "B"}, {"value": "C"}],
+     [{"path": "queries", "error": "Expected a list of 1 to 2 queries."}]),
+    (["BANANA"], [{"path": "queries[0]", "error": "Expected an object."}]),
+    ([{"corpNum": "BC0000001"}], [{"path": "queries[0].value", "error": "Expected a non-empty string."}]),
+    ([{"key": "1"}], [{"path": "queries[0].value", "error": "Expected a non-empty string."}]),
+    ([{"value": " "}], [{"path": "queries[0].value", "error": "Expected a non-empty string."}]),
+    ([{"value": "BANANA", "key": 1}], [{"path": "queries[0].key", "error": "Expected a non-empty string."}]),
+    ([{"value": 1, "key": "1"}], [{"path": "queries[0].value", "error": "Expected a non-empty string."}]),
+    ([{"value": "BANANA", "categories": {"state": "ACTIVE"}}],
+     [{"path": "queries[0].categories.state", "error": "Expected a list of strings."}]),
+    ([{"value": "BANANA"}, {"value": "BANANA"}], [{"path": "queries[1].key", "error": "Duplicate key 'BANANA'."}]),
+    ([{"value": "BANANA", "key": "1"}, {"value": "APPLE", "key": "1"}],
+     [{"path": "queries[1].key", "error": "Duplicate key '1'."}]),
+])
+def test_get_bulk_query_keys_errors(queries, expected_errors: list[dict]):
+    """Assert invalid bulk queries are reported."""
+    _, errors = get_bulk_query_keys(queries, 2)
+    assert errors == expected_errors
+
+
+@pytest.mark.parametrize("categories,expected_errors", [
+    ({}, []),
+    ({"jurisdiction": ["BC"], "state": None, "name_state": ["A", "C"], "other": 1}, []),
+    (["BC"], [{"path": "categories", "error": "Expected an object."}]),
+    ({"jurisdiction": "BC"}, [{"path": "categories.jurisdiction", "error": "Expected a list of strings."}]),
+    ({"name_state": ["A", 1]}, [{"path": "categories.name_state", "error": "Expected a list of strings."}]),
+])
+def test_get_categories_errors(categories, expected_errors: list[dict]):
+    """Assert invalid search categories are reported."""
+    assert get_categories_errors(categories, "categories") == expected_errors
+
+
+@pytest.mark.parametrize("request_json,expected_errors", [
+    ({}, []),
+    ({"start": 0, "rows": 100}, []),
+    ({"start": -1}, [{"path": "start", "error": "Expected a non-negative integer."}]),
+    ({"start": "10"}, [{"path": "start", "error": "Expected a non-negative integer."}]),
+    ({"rows": 101}, [{"path": "rows", "error": "Expected an integer between 0 and 100."}]),
+    ({"rows": True}, [{"path": "rows", "error": "Expected an integer between 0 and 100."}]),
+])
+def test_get_paging_errors(request_json: dict, expected_errors: list[dict]):
+    """Assert invalid search paging is reported."""
+    assert get_paging_errors(request_json, 100) == expected_errors
+
+
+def stream_results(chunks: Iterable[bytes], mocker) -> tuple[dict, object]:
+    """Return the decoded streamed search results and the mocked cache set."""
+    cache_set = mocker.patch.object(search_result_cache, "set")
+    results = "".join(stream_search_results(SolrDocStream(chunks), {"rows": 10}, "key"))
+    return json.loads(results), cache_set
+
+
+def test_stream_search_results(app, mocker):
+    """Assert the streamed docs are returned as the search results json and cached."""
+    chunk_size = 7
+    results, cache_set = stream_results(
+        [SOLR_RESPONSE[index:index + chunk_size] for index in range(0, len(SOLR_RESPONSE), chunk_size)], mocker)
+    expected = {"queryInfo": {"rows": 10}, "totalResults": 3, "results": [{"id": "NR 1"}, {"id": "NR 2"}, {"id": "NR 3"}]}
+    assert results == {"searchResults": expected}
+    cache_set.assert_called_once_with("key", expected)
+
+
+@pytest.mark.parametrize("truncate_at", [
+    SOLR_RESPONSE.index(b'{"id": "NR 2"}') + 5,
+    SOLR_RESPONSE.index(b'{"id": "NR 3"}'),
+    len(SOLR_RESPONSE) - 2,
+])
+def test_stream_search_results_truncated(app, mocker, truncate_at: int):
+    """Assert a solr response cut off after the first doc ends the results with an error (and is not cached)."""
+    results, cache_set = stream_results([SOLR_RESPONSE[:20], SOLR_RESPONSE[20:truncate_at]], mocker)
+    assert results["searchResults"]["error"] == "Error reading Solr response. The results are incomplete."
+    assert results["searchResults"]["results"][0] == {"id": "NR 1"}
+    cache_set.assert_not_called()
+
+
+def test_stream_search_results_read_error(app, mocker):
+    """Assert an error reading the solr response after the first doc ends the results with an error."""
+    def chunks():
+        """Yield the first doc then fail."""
+        yield SOLR_RESPONSE[:SOLR_RESPONSE.index(b'{"id": "NR 2"}')]
+        raise ConnectionError("reset")
+
+    results, cache_set = stream_results(chunks(), mocker)
+    assert results["searchResults"]["results"] == [{"id": "NR 1"}]
+    assert "error" in results["searchResults"]
+    cache_set.assert_not_called()
@@ -0,0 +1,81 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the search history writer queues rows as expected."""
+import queue
+
+import pytest
+
+from namex_solr_api.services.search_history_writer import SearchHistoryWriter
+
+
+@pytest.fixture
+def writer(app, mocker, monkeypatch):
+    """Return an async writer with a full queue (the background flusher and db insert are mocked)."""
+    monkeypatch.setitem(app.config, "SEARCH_HISTORY_QUEUE_SIZE", 1)
+    monkeypatch.setitem(app.config, "SEARCH_HISTORY_ASYNC", True)
+    history_writer = SearchHistoryWriter(app)
+    mocker.patch.object(history_writer, "_start")
+    mocker.patch.object(history_writer, "_insert")
+    history_writer.record({"value": "FIRST"}, [], 1)
+    yield history_writer
+    # NOTE: emptied so the exit flush doesn't try to write the row
+    history_writer._queue = queue.Queue()
+
+
+def test_record_full_queue_drop(writer: SearchHistoryWriter):
+    """Assert the row is dropped when the queue is full and the policy is 'drop'."""
+    writer.full_policy = "drop"
+    writer.record({"value": "SECOND"}, [], 1)
+    writer._insert.assert_not_called()
+    assert writer.stats() == {
+        "queued": 1, "written": 0, "dropped": 1, "sampledOut": 0, "failed": 0, "pending": 1, "enabled": True}
+
+
+def test_record_full_queue_sync(writer: SearchHistoryWriter):
+    """Assert the row is written by the caller when the queue is full and the policy is 'sync'."""
+    writer.full_policy = "sync"
+    writer.record({"value": "SECOND"}, [], 1)
+    writer._insert.assert_called_once()
+    assert writer._insert.call_args.args[0][0]["query"] == {"value": "SECOND"}
+    assert writer.stats()["dropped"] == 0
+    assert writer.stats()["pending"] == 1
+
+
+def test_flush(writer: SearchHistoryWriter, mocker):
+    """Assert flushing writes the queued rows in batches."""
+    write = mocker.patch.object(writer, "_write")
+    writer.flush()
+    write.assert_called_once()
+    assert write.call_args.args[0][0]["query"] == {"value": "FIRST"}
+    assert writer.stats()["pending"] == 0
@@ -0,0 +1,137 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the search result cache keys and index version work as expected."""
+import threading
+
+import pytest
+
+from namex_solr_api.exceptions import SolrException
+from namex_solr_api.resources.v1.search import get_possible_conflict_names_params
+from namex_solr_api.services import solr
+from namex_solr_api.services.namex_solr.doc_models import PCField
+from namex_solr_api.services.search_result_cache import SearchResultCache
+
+
+@pytest.fixture
+def search_cache(app, mocker):
+    """Return an enabled search result cache with a fixed index version."""
+    cache = SearchResultCache(solr)
+    cache.enabled = True
+    mocker.patch.object(solr, "get_index_version", return_value="1.1")
+    return cache
+
+
+def get_params(value: str, categories: dict | None = None, start: int = 0, rows: int = 10):
+    """Return the possible conflict names params for the value."""
+    return get_possible_conflict_names_params({"value": value}, categories or {}, start, rows)
+
+
+def test_get_key_same_search(search_cache: SearchResultCache):
+    """Assert the same search gets the same key (category order / duplicates don't matter)."""
+    key = search_cache.get_key("test", get_params("BANANA ORCHARD", {PCField.STATE.value: ["ACTIVE", "APPROVED"]}))
+    assert key
+    assert key == search_cache.get_key(
+        "test", get_params("BANANA ORCHARD", {PCField.STATE.value: ["APPROVED", "ACTIVE", "ACTIVE"]}))
+
+
+@pytest.mark.parametrize("value,other_value,other_kwargs", [
+    ("BANANA ORCHARD", "BANANA ORCHARD", {"start": 10}),
+    ("BANANA ORCHARD", "BANANA ORCHARD", {"rows": 20}),
+    ("BANANA ORCHARD", "BANANA ORCHARD", {"categories": {PCField.STATE.value: ["ACTIVE"]}}),
+    ("BANANA ORCHARD", "APPLE ORCHARD", {}),
+])
+def test_get_key_different_search(search_cache: SearchResultCache, value: str, other_value: str, other_kwargs: dict):
+    """Assert searches that can return different results get different keys."""
+    assert search_cache.get_key("test", get_params(value)) != search_cache.get_key(
+        "test", get_params(other_value, **other_kwargs))
+
+
+@pytest.mark.parametrize("value,other_value", [
+    ("BANANA-ORCHARD", "BANANA ORCHARD"),
+    ("BANANA ORCHARD LIMITED", "BANANA ORCHARD"),
+])
+def test_get_key_different_ranking(search_cache: SearchResultCache, value: str, other_value: str):
+    """Assert values with the same prepped query but different full query boosts get different keys."""
+    params = get_params(value)
+    other_params = get_params(other_value)
+    assert params.query == other_params.query
+    assert search_cache.get_key("test", params) != search_cache.get_key("test", other_params)
+
+
+def test_get_key_index_version(search_cache: SearchResultCache):
+    """Assert the key changes with the index version and searches are not cached without one."""
+    params = get_params("BANANA ORCHARD")
+    key = search_cache.get_key("test", params)
+    solr.get_index_version.return_value = "1.2"
+    search_cache.version_interval = 0
+    assert search_cache.get_key("test", params) not in [key, None]
+    solr.get_index_version.side_effect = SolrException(error="down")
+    assert search_cache.get_key("test", params) is None
+
+
+def test_get_key_bypassed(search_cache: SearchResultCache):
+    """Assert searches are not cached when disabled or over the max rows."""
+    assert search_cache.get_key("test", get_params("BANANA", rows=search_cache.max_rows + 1)) is None
+    search_cache.enabled = False
+    assert search_cache.get_key("test", get_params("BANANA")) is None
+    assert search_cache.stats()["bypassed"] == 2  # noqa: PLR2004
+
+
+def test_get_index_version_interval(search_cache: SearchResultCache):
+    """Assert the index version is only fetched once per interval."""
+    assert search_cache.get_index_version() == "1.1"
+    assert search_cache.get_index_version() == "1.1"
+    assert solr.get_index_version.call_count == 1
+
+
+def test_get_index_version_not_blocked(search_cache: SearchResultCache):
+    """Assert other searches use the last version instead of waiting on a refresh in progress."""
+    fetching = threading.Event()
+    release = threading.Event()
+
+    def slow_version():
+        fetching.set()
+        release.wait(5)
+        return "1.2"
+
+    search_cache.get_index_version()
+    search_cache.version_interval = 0
+    solr.get_index_version.side_effect = slow_version
+    refresh = threading.Thread(target=search_cache.get_index_version)
+    refresh.start()
+    assert fetching.wait(5)
+    assert search_cache.get_index_version() == "1.1"
+    release.set()
+    refresh.join(5)
+    assert search_cache.stats()["indexVersion"] == "1.2"
@@ -0,0 +1,96 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure solr json responses are streamed as expected."""
+import json
+
+import pytest
+
+from namex_solr_api.services.base_solr.utils.stream_parser import SolrDocStream
+
+RESPONSE = json.dumps({
+    "responseHeader": {"status": 0, "QTime": 3},
+    "response": {"numFound": 3, "start": 0, "docs": [{"id": "1", "name": "ÉCOLE"}, {"id": "2"}, {"id": 3.25}]},
+    "highlighting": {"1": {"name": ["<b>ÉCOLE</b>"]}},
+}).encode()
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    """Return the data in chunks of the given size."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, len(RESPONSE)])
+def test_solr_doc_stream(chunk_size: int):
+    """Assert the docs and meta are parsed the same however the response is split (incl. mid utf-8 char)."""
+    expected = json.loads(RESPONSE)
+    stream = SolrDocStream(split(RESPONSE, chunk_size))
+    assert stream.meta["response"]["numFound"] == 3  # noqa: PLR2004
+    assert "highlighting" not in stream.meta
+    assert list(stream) == expected["response"]["docs"]
+    assert stream.meta["highlighting"] == expected["highlighting"]
+    assert stream.meta["responseHeader"] == expected["responseHeader"]
+
+
+def test_solr_doc_stream_no_docs():
+    """Assert a response without docs is parsed."""
+    stream = SolrDocStream([b'{"response": {"numFound": 0, "docs": []}}'])
+    assert list(stream) == []
+    assert stream.meta["response"]["numFound"] == 0
+
+
+@pytest.mark.parametrize("cut", [len(RESPONSE) // 2, len(RESPONSE) - 1, RESPONSE.index(b'"docs"') + 10])
+def test_solr_doc_stream_truncated(cut: int):
+    """Assert a truncated response raises an error instead of ending early."""
+    with pytest.raises(ValueError):  # noqa: PT011
+        list(SolrDocStream(split(RESPONSE[:cut], 5)))
+
+
+def test_solr_doc_stream_trailing_data():
+    """Assert data after the response raises an error."""
+    with pytest.raises(ValueError, match="Unexpected data after solr response."):
+        list(SolrDocStream([RESPONSE, b" {}"]))
+
+
+def test_solr_doc_stream_close():
+    """Assert the response is released once when the docs are exhausted or the stream is closed."""
+    closed = []
+    stream = SolrDocStream(split(RESPONSE, 10), on_close=lambda: closed.append(True))
+    list(stream)
+    stream.close()
+    assert closed == [True]
+
+    closed = []
+    with SolrDocStream(split(RESPONSE, 10), on_close=lambda: closed.append(True)) as stream:
+        next(iter(stream))
+    assert closed == [True]
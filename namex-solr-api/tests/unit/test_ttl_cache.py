@@ -0,0 +1,105 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure the ttl cache expires and evicts entries as expected."""
+import pytest
+
+from namex_solr_api.common import ttl_cache
+from namex_solr_api.common.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Return a controllable clock used by the cache."""
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expiry(clock):
+    """Assert entries expire after the ttl."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+
+    clock[0] += 0.1
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+    assert cache.stats() == {
+        "size": 0, "maxsize": 10, "ttl": 5, "hits": 1, "misses": 1, "evictions": 1, "hitRate": 0.5}
+
+
+def test_ttl_cache_set_resets_expiry(clock):
+    """Assert setting an entry again restarts its ttl."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    clock[0] += 4
+    cache.set("a", 2)
+    clock[0] += 4
+    assert cache.get("a") == 2  # noqa: PLR2004
+
+
+def test_ttl_cache_lru(clock):
+    """Assert the least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # a is now the most recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3  # noqa: PLR2004
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_disabled():
+    """Assert nothing is cached when the max size is 0."""
+    cache = TTLCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_get_or_set(clock):
+    """Assert the factory is only called on a miss (including cached falsy values)."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    calls = []
+
+    def factory():
+        calls.append(True)
+        return 0
+
+    assert cache.get_or_set("a", factory) == 0
+    assert cache.get_or_set("a", factory) == 0
+    assert len(calls) == 1
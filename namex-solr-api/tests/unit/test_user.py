@@ -0,0 +1,78 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Test Suite to ensure users are resolved from the jwt and cached as expected."""
+import pytest
+
+from namex_solr_api.models import User
+from namex_solr_api.models.user import user_cache
+
+TOKEN = {
+    "idp_userid": "123",
+    "username": "idir/tester",
+    "firstname": "Test",
+    "lastname": "User",
+    "sub": "abc",
+    "iss": "issuer",
+    "loginSource": "IDIR",
+}
+
+
+@pytest.fixture
+def find_user(app, mocker):
+    """Mock the user db lookup (returns a saved user matching the token)."""
+    user_cache.clear()
+    user = User(id=1, username="idir/tester", firstname="Test", lastname="User", sub="abc", iss="issuer",
+                login_source="IDIR", unique_user_key="123")
+    yield mocker.patch.object(User, "find_by_jwt_token", return_value=user)
+    user_cache.clear()
+
+
+def test_get_or_create_user_by_jwt_cached(find_user):
+    """Assert the user is cached after the first lookup and returned from the cache after that."""
+    user = User.get_or_create_user_by_jwt(TOKEN)
+    cached_user = User.get_or_create_user_by_jwt(TOKEN)
+    find_user.assert_called_once()
+    assert cached_user.id == user.id
+    assert cached_user.username == user.username
+    assert cached_user.display_name == "Test User"
+
+
+@pytest.mark.parametrize("changed", [{"firstname": "New"}, {"sub": "def"}, {"idp_userid": "456"}])
+def test_get_or_create_user_by_jwt_changed(find_user, mocker, changed: dict):
+    """Assert a token with different user claims is not served the cached user."""
+    User.get_or_create_user_by_jwt(TOKEN)
+    find_user.return_value = None
+    create = mocker.patch.object(User, "create_from_jwt_token", return_value=None)
+    User.get_or_create_user_by_jwt({**TOKEN, **changed})
+    create.assert_called_once_with({**TOKEN, **changed})
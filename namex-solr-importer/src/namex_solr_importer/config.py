@@ -67,6 +67,9 @@ class Config:
     SOLR_API_URL = os.getenv("SOLR_API_URL", "http://")
 
     BATCH_SIZE = int(os.getenv("SOLR_BATCH_UPDATE_SIZE", "1000"))
+    # gzip the import batches sent to the api (only enable once the api accepts gzip request bodies)
+    IMPORT_GZIP = os.getenv("IMPORT_GZIP", "False") == "True"
+    IMPORT_GZIP_LEVEL = int(os.getenv("IMPORT_GZIP_LEVEL", "5"))
     REINDEX_CORE = os.getenv("REINDEX_CORE", "False") == "True"
 
     MODERNIZED_LEGAL_TYPES = os.getenv("MODERNIZED_LEGAL_TYPES", "BEN,CBEN,CP,GP,SP").upper().split(",")
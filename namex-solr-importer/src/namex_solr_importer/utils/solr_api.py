@@ -33,6 +33,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Manages util methods for updating possible conflict records via the namex solr api."""
 
+import gzip
+import json
 import time
 from http import HTTPStatus
 
@@ -72,14 +74,22 @@ def import_conflicts(docs: list[dict], data_name: str, partial=False) -> int:
         # call api import endpoint
         try:
             current_app.logger.debug("Importing batch...")
-            import_resp = requests.put(
-                url=f"{current_app.config.get("SOLR_API_URL")}/internal/solr/import",
-                headers=headers,
-                json={
+            payload = json.dumps(
+                {
                     "possibleConflicts": docs[offset:count],
                     "timeout": "60",
                     "type": "partial" if partial else "full",
                 },
+                allow_nan=False,
+            ).encode()
+            import_headers = {**headers, "Content-Type": "application/json"}
+            if current_app.config.get("IMPORT_GZIP"):
+                payload = gzip.compress(payload, compresslevel=current_app.config.get("IMPORT_GZIP_LEVEL"))
+                import_headers["Content-Encoding"] = "gzip"
+            import_resp = requests.put(
+                url=f"{current_app.config.get("SOLR_API_URL")}/internal/solr/import",
+                headers=import_headers,
+                data=payload,
                 timeout=90,
             )
 